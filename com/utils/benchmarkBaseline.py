@@ -0,0 +1,160 @@
+from json import dump, load, loads
+from os import getcwd, replace
+from os.path import dirname, exists
+from sys import argv
+
+
+class BenchmarkBaseline:
+    """
+    Stores benchmark results as baselines and compares new results against them.
+
+    A baseline is kept per solver, instance, strategy and time limit. A metric regresses when
+    it grows over the baseline by more than its relative tolerance and, so that milliseconds of
+    timer noise are not taken for regressions, by more than its absolute tolerance as well.
+    Parse times are only compared when both runs parsed the file, or both loaded the cache.
+    """
+    METRICS = ['parse_seconds', 'model_build_seconds', 'solve_seconds', 'peak_rss_megabytes', 'objective']
+    TOLERANCES = {
+        'parse_seconds': {'relative': 0.5, 'absolute': 0.05},
+        'model_build_seconds': {'relative': 0.5, 'absolute': 0.05},
+        'solve_seconds': {'relative': 0.5, 'absolute': 0.05},
+        'peak_rss_megabytes': {'relative': 0.2, 'absolute': 10},
+        'objective': {'relative': 0.02, 'absolute': 0}
+    }
+
+    file_path: str = None
+    tolerances: dict = None
+    baselines: dict = None
+
+    def __init__(self, file_path, tolerances=None):
+        self.file_path = file_path
+        self.tolerances = {**self.TOLERANCES, **(tolerances if tolerances is not None else {})}
+        self.baselines = {}
+
+        if exists(self.file_path):
+            with open(file=self.file_path, mode='r') as baseline_file:
+                self.baselines = load(baseline_file)
+
+    @staticmethod
+    def key(record):
+        return f"{record['solver']}/{record['instance']}/{record['strategy']}/{record.get('time_limit_seconds')}"
+
+    @staticmethod
+    def read_results(file_path):
+        with open(file=file_path, mode='r') as results_file:
+            return [loads(line) for line in results_file if line.strip()]
+
+    def store(self, records):
+        for record in records:
+            if 'error' not in record:
+                self.baselines[self.key(record)] = record
+
+        with open(file=self.file_path + '.tmp', mode='w') as baseline_file:
+            dump(self.baselines, baseline_file, indent=2, sort_keys=True)
+
+        replace(self.file_path + '.tmp', self.file_path)
+
+    def compare(self, records):
+        comparisons = []
+
+        for record in records:
+            key = self.key(record)
+            baseline = self.baselines.get(key)
+
+            if 'error' in record:
+                comparisons.append({'key': key, 'metric': 'error', 'status': 'REGRESSION', 'detail': record['error']})
+                continue
+
+            if baseline is None:
+                comparisons.append({'key': key, 'metric': None, 'status': 'NEW', 'detail': 'no baseline stored'})
+                continue
+
+            for metric in self.METRICS:
+                comparisons.append(self.__compare_metric(key=key, metric=metric, baseline=baseline, record=record))
+
+        return comparisons
+
+    def __compare_metric(self, key, metric, baseline, record):
+        comparison = {
+            'key': key,
+            'metric': metric,
+            'baseline': baseline.get(metric),
+            'current': record.get(metric),
+            'delta': None,
+            'delta_percent': None
+        }
+
+        if metric == 'parse_seconds' and baseline.get('loaded_from_cache') != record.get('loaded_from_cache'):
+            return {**comparison, 'status': 'SKIPPED', 'detail': 'one run parsed the file, the other loaded the cache'}
+
+        if comparison['baseline'] is None and comparison['current'] is None:
+            return {**comparison, 'status': 'SKIPPED', 'detail': 'not measured'}
+
+        if comparison['current'] is None:
+            # an objective lost means no solution found where the baseline had one
+            return {**comparison, 'status': 'REGRESSION', 'detail': 'missing from the current run'}
+
+        if comparison['baseline'] is None:
+            return {**comparison, 'status': 'OK', 'detail': 'missing from the baseline'}
+
+        tolerance = self.tolerances[metric]
+        comparison['delta'] = comparison['current'] - comparison['baseline']
+        comparison['delta_percent'] = 100 * comparison['delta'] / comparison['baseline'] \
+            if comparison['baseline'] != 0 else None
+        allowed_delta = max(tolerance['relative'] * abs(comparison['baseline']), tolerance['absolute'])
+
+        if comparison['delta'] > allowed_delta:
+            return {**comparison, 'status': 'REGRESSION', 'detail': f'allowed up to +{allowed_delta:g}'}
+
+        return {**comparison, 'status': 'OK', 'detail': None}
+
+    @staticmethod
+    def report(comparisons):
+        def format_value(value):
+            return f'{value:.6g}' if isinstance(value, float) else str(value)
+
+        lines = []
+
+        for comparison in comparisons:
+            if comparison['metric'] is None or comparison['metric'] == 'error':
+                lines.append(f"{comparison['status']:10} {comparison['key']}: {comparison['detail']}")
+                continue
+
+            delta_percent = f"{comparison['delta_percent']:+.1f}%" if comparison['delta_percent'] is not None else '-'
+            lines.append(
+                f"{comparison['status']:10} {comparison['key']} {comparison['metric']:20} "
+                f"{format_value(comparison['baseline']):>16} -> {format_value(comparison['current']):<16} {delta_percent:>9}"
+                + (f"  ({comparison['detail']})" if comparison['detail'] else '')
+            )
+
+        regressions = sum(comparison['status'] == 'REGRESSION' for comparison in comparisons)
+        lines.append(f'{regressions} regressions in {len(comparisons)} comparisons')
+
+        return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    if len(argv) < 3 or argv[1] not in ['store', 'compare']:
+        raise SystemExit(
+            'Usage: benchmarkBaseline.py store <benchmark jsonl file>\n'
+            '       benchmarkBaseline.py compare <benchmark jsonl file> [metric=relative_tolerance ...]'
+        )
+
+    benchmark_baseline = BenchmarkBaseline(
+        file_path=r"{}\benchmarks\baseline.json".format(dirname(getcwd())),
+        tolerances={
+            metric: {**BenchmarkBaseline.TOLERANCES[metric], 'relative': float(relative_tolerance)}
+            for metric, relative_tolerance in (argument.split('=') for argument in argv[3:])
+        }
+    )
+    benchmark_records = BenchmarkBaseline.read_results(file_path=argv[2])
+
+    if argv[1] == 'store':
+        benchmark_baseline.store(records=benchmark_records)
+        print(f'{len(benchmark_records)} results stored as baselines in {benchmark_baseline.file_path}')
+    else:
+        benchmark_comparisons = benchmark_baseline.compare(records=benchmark_records)
+        print(BenchmarkBaseline.report(comparisons=benchmark_comparisons))
+
+        if any(comparison['status'] == 'REGRESSION' for comparison in benchmark_comparisons):
+            raise SystemExit('Performance regression against the stored benchmark baselines')
@@ -0,0 +1,112 @@
+from struct import Struct
+from time import perf_counter
+
+from numpy import dtype as array_dtype, fromfile, genfromtxt
+from ortools.constraint_solver import pywrapcp
+
+from com.utils.incumbentRecorder import IncumbentRecorder
+
+
+class ConvergenceTrace:
+    """
+    Solution callback streaming every improving solution of a search to an append-only trace.
+
+    Each record holds the seconds since the search started, the objective, how many solutions
+    the search had found so far and the memory used by the solver. Records are written as soon
+    as they happen, so the trace of a run interrupted after hours is still readable. The csv
+    format is meant to be opened anywhere, the binary one packs each record on 32 bytes and is
+    read back with read(). Improvements are the ones of the model cost the search minimizes; when
+    objective_function is given, the routes of each of them are read and the objective it
+    answers is the one traced instead of the cost.
+    """
+    FORMATS = ['csv', 'binary']
+    FIELDS = ['seconds', 'objective', 'solutions', 'memory_bytes']
+    RECORD = Struct('<dqqq')
+    RECORD_DTYPE = array_dtype([
+        ('seconds', '<f8'), ('objective', '<i8'), ('solutions', '<i8'), ('memory_bytes', '<i8')
+    ])
+
+    routing = None
+    file_path: str = None
+    trace_format: str = None
+    solutions: int = None
+    improvements: int = None
+    best_objective: int = None
+    manager = None
+    num_vehicles: int = None
+    objective_function = None
+    __best_cost = None
+    __trace_file = None
+    __start_time = None
+
+    def __init__(
+            self,
+            routing,
+            file_path,
+            trace_format='csv',
+            manager=None,
+            num_vehicles=None,
+            objective_function=None
+    ):
+        if trace_format not in self.FORMATS:
+            raise ValueError(f'Unknown convergence trace format {trace_format}, expected one of {self.FORMATS}')
+
+        self.routing = routing
+        self.file_path = file_path
+        self.trace_format = trace_format
+        self.solutions = 0
+        self.improvements = 0
+        self.manager = manager
+        self.num_vehicles = num_vehicles
+        self.objective_function = objective_function
+
+    def start(self):
+        if self.trace_format == 'csv':
+            self.__trace_file = open(file=self.file_path, mode='a', buffering=1)
+
+            if self.__trace_file.tell() == 0:
+                self.__trace_file.write(','.join(self.FIELDS) + '\n')
+        else:
+            self.__trace_file = open(file=self.file_path, mode='ab')
+
+        self.__start_time = perf_counter()
+
+    def __call__(self):
+        self.solutions += 1
+        cost = self.routing.CostVar().Value()
+
+        if self.__best_cost is not None and cost >= self.__best_cost:
+            return
+
+        self.__best_cost = cost
+        objective = cost
+
+        if self.objective_function is not None:
+            objective = self.objective_function(IncumbentRecorder.current_routes(
+                routing=self.routing,
+                manager=self.manager,
+                num_vehicles=self.num_vehicles
+            ))
+
+        self.best_objective = objective
+        self.improvements += 1
+        seconds = perf_counter() - self.__start_time
+        memory_bytes = pywrapcp.Solver.MemoryUsage()
+
+        if self.trace_format == 'csv':
+            self.__trace_file.write(f'{seconds:.6f},{objective},{self.solutions},{memory_bytes}\n')
+        else:
+            self.__trace_file.write(self.RECORD.pack(seconds, objective, self.solutions, memory_bytes))
+            self.__trace_file.flush()
+
+    def close(self):
+        if self.__trace_file is not None:
+            self.__trace_file.close()
+            self.__trace_file = None
+
+    @classmethod
+    def read(cls, file_path):
+        if file_path.endswith('.csv'):
+            return genfromtxt(file_path, delimiter=',', names=True, dtype=cls.RECORD_DTYPE, ndmin=1)
+
+        return fromfile(file_path, dtype=cls.RECORD_DTYPE)
@@ -0,0 +1,225 @@
+from numpy import arange, asarray, empty, full, iinfo, int8, int16, int32, int64, uint8, uint16, uint32, uint64
+from numpy import maximum as array_maximum, minimum as array_minimum
+
+
+class DistanceMatrix(list):
+    """
+    Distance matrix stored as one contiguous array of fixed-width integers.
+
+    The dtype is the narrowest one able to hold every distance, so a 2000 nodes instance costs a
+    few megabytes instead of the hundreds taken by a list of lists of Python ints. The matrix
+    itself is a list of memoryviews over the rows of that array, so the usual matrix[i][j] keeps
+    working at list speed and answers plain Python ints, which is what the OR-Tools callbacks
+    and the existing sums expect.
+    """
+    UNSIGNED_DTYPES = [uint8, uint16, uint32, uint64]
+    SIGNED_DTYPES = [int8, int16, int32, int64]
+
+    values = None
+
+    def __init__(self, values, dtype=None):
+        values = asarray(values)
+
+        if dtype is None:
+            dtype = self.narrowest_dtype(
+                minimum=int(values.min()) if values.size else 0,
+                maximum=int(values.max()) if values.size else 0
+            )
+
+        self.values = values if values.dtype == dtype else values.astype(dtype)
+        super().__init__(memoryview(row) for row in self.values)
+
+    @classmethod
+    def narrowest_dtype(cls, minimum, maximum):
+        for dtype in cls.UNSIGNED_DTYPES if minimum >= 0 else cls.SIGNED_DTYPES:
+            if iinfo(dtype).min <= minimum and maximum <= iinfo(dtype).max:
+                return dtype
+
+        raise OverflowError(f'Distances between {minimum} and {maximum} do not fit on a 64 bits integer')
+
+    @staticmethod
+    def is_symmetric(values, block_size=512):
+        if values.ndim != 2 or values.shape[0] != values.shape[1]:
+            return False
+
+        for start in range(0, len(values), block_size):
+            end = min(start + block_size, len(values))
+
+            if not (values[start:end] == values[:, start:end].T).all():
+                return False
+
+        return True
+
+    def distance(self, from_node, to_node):
+        return self[from_node][to_node]
+
+    def gather(self, from_nodes, to_nodes):
+        return self.values[asarray(from_nodes, dtype=int64), asarray(to_nodes, dtype=int64)]
+
+    def __reduce__(self):
+        return self.__class__, (self.values, self.values.dtype)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.values
+
+        return self.values.astype(dtype)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def tolist(self):
+        return self.values.tolist()
+
+
+class SymmetricDistanceMatrix:
+    """
+    Symmetric distance matrix keeping only the packed upper triangle, diagonal included.
+
+    Row i of the triangle starts at row_offset(i) + i, so the distance between i <= j is stored
+    at row_offset(i) + j. Each row is kept as a memoryview starting at row_offset(i), which turns
+    distance(i, j) into one comparison and two C level subscripts. matrix[i] answers a row
+    proxy for the callers that expect a full matrix, so matrix[i][j] costs one distance(i, j)
+    call, while iterating over the row gathers it whole.
+    """
+    values = None
+    size = None
+    distance = None
+    __rows = None
+    __row_proxies = None
+
+    def __init__(self, values, size, dtype=None):
+        values = asarray(values)
+
+        if dtype is None:
+            dtype = DistanceMatrix.narrowest_dtype(
+                minimum=int(values.min()) if values.size else 0,
+                maximum=int(values.max()) if values.size else 0
+            )
+
+        self.values = values if values.dtype == dtype else values.astype(dtype)
+        self.size = size
+        self.__rows = [
+            memoryview(self.values[self.row_offset(row, size):self.row_offset(row, size) + size])
+            for row in range(size)
+        ]
+
+        rows = self.__rows
+
+        def distance(from_node, to_node):
+            if from_node <= to_node:
+                return rows[from_node][to_node]
+
+            return rows[to_node][from_node]
+
+        self.distance = distance
+        self.__row_proxies = [SymmetricDistanceRow(matrix=self, row=row, rows=rows) for row in range(size)]
+
+    @staticmethod
+    def row_offset(row, size):
+        return row * size - row * (row + 1) // 2
+
+    @staticmethod
+    def packed_length(size):
+        return size * (size + 1) // 2
+
+    @classmethod
+    def from_full(cls, values, dtype=None):
+        size = len(values)
+        packed_values = empty(cls.packed_length(size), dtype=values.dtype)
+
+        for row in range(size):
+            offset = cls.row_offset(row, size)
+            packed_values[offset + row:offset + size] = values[row, row:]
+
+        return cls(packed_values, size=size, dtype=dtype)
+
+    def packed_index(self, from_nodes, to_nodes):
+        lower_nodes = array_minimum(from_nodes, to_nodes)
+        upper_nodes = array_maximum(from_nodes, to_nodes)
+
+        return lower_nodes * self.size - lower_nodes * (lower_nodes + 1) // 2 + upper_nodes
+
+    def gather(self, from_nodes, to_nodes):
+        return self.values[self.packed_index(asarray(from_nodes, dtype=int64), asarray(to_nodes, dtype=int64))]
+
+    def __getitem__(self, row):
+        return self.__row_proxies[row]
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (self[row] for row in range(self.size))
+
+    def __reduce__(self):
+        return self.__class__, (self.values, self.size, self.values.dtype)
+
+    def __array__(self, dtype=None, copy=None):
+        rows = arange(self.size)
+        values = self.values[self.packed_index(rows[:, None], rows[None, :])]
+
+        return values if dtype is None else values.astype(dtype)
+
+    @property
+    def shape(self):
+        return self.size, self.size
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def tolist(self):
+        return self.__array__().tolist()
+
+
+class SymmetricDistanceRow:
+    """Row of a SymmetricDistanceMatrix, answering single distances without gathering the row."""
+    __slots__ = ['matrix', 'row', 'rows']
+
+    def __init__(self, matrix, row, rows):
+        self.matrix = matrix
+        self.row = row
+        self.rows = rows
+
+    def __getitem__(self, column):
+        if column < 0:
+            # negative columns count from the end, as on the rows of a full DistanceMatrix
+            column += self.matrix.size
+
+            if column < 0:
+                raise IndexError('column index out of range')
+
+        if self.row <= column:
+            return self.rows[self.row][column]
+
+        return self.rows[column][self.row]
+
+    def __len__(self):
+        return self.matrix.size
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.matrix.values[
+            self.matrix.packed_index(full(self.matrix.size, self.row, dtype=int64), arange(self.matrix.size))
+        ]
+
+        return values if dtype is None else values.astype(dtype)
+
+    def tolist(self):
+        return self.__array__().tolist()
@@ -0,0 +1,112 @@
+from collections import OrderedDict
+
+from numpy import asarray, dtype as array_dtype, float64
+
+
+class LazyDistanceOracle:
+    """
+    Distance matrix of a coordinates instance that is never materialized.
+
+    Rows are computed from the points on demand and kept on a bounded LRU cache, so memory is
+    O(cache_rows * size) instead of O(size^2). Being symmetric, a lookup is also answered from
+    the cached row of the destination node before computing anything. The hit and miss
+    counters are meant to size cache_rows for an instance.
+    """
+    points = None
+    size = None
+    cache_rows = None
+    hits = None
+    misses = None
+    evictions = None
+    __distance_block = None
+    __dtype = None
+    __rows = None
+
+    def __init__(self, points, distance_block, dtype, cache_rows=1024):
+        self.points = asarray(points, dtype=float64)
+        self.size = len(self.points)
+        self.cache_rows = cache_rows
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__distance_block = distance_block
+        self.__dtype = dtype
+        self.__rows = OrderedDict()
+
+    def __row(self, node):
+        row = self.__rows.get(node)
+
+        if row is not None:
+            self.hits += 1
+            self.__rows.move_to_end(node)
+            return row
+
+        self.misses += 1
+        row = memoryview(self.__distance_block(
+            x0=self.points[node:node + 1, 0],
+            x1=self.points[:, 0],
+            y0=self.points[node:node + 1, 1],
+            y1=self.points[:, 1]
+        )[0].astype(self.__dtype))
+
+        self.__rows[node] = row
+
+        if len(self.__rows) > self.cache_rows:
+            self.__rows.popitem(last=False)
+            self.evictions += 1
+
+        return row
+
+    def distance(self, from_node, to_node):
+        row = self.__rows.get(to_node)
+
+        if row is not None and from_node not in self.__rows:
+            self.hits += 1
+            self.__rows.move_to_end(to_node)
+            return row[from_node]
+
+        return self.__row(from_node)[to_node]
+
+    def gather(self, from_nodes, to_nodes):
+        # consecutive arcs of a route share their nodes, so pairs are answered through the row cache
+        return asarray(
+            [self.distance(int(from_node), int(to_node)) for from_node, to_node in zip(from_nodes, to_nodes)],
+            dtype=self.dtype
+        )
+
+    def cache_statistics(self):
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else None,
+            'cached_rows': len(self.__rows),
+            'cache_rows': self.cache_rows,
+            'cached_megabytes': len(self.__rows) * self.size * self.dtype.itemsize / 1000000
+        }
+
+    def __getitem__(self, row):
+        return self.__row(row)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (self.__row(row) for row in range(self.size))
+
+    def __reduce__(self):
+        return self.__class__, (self.points, self.__distance_block, self.__dtype, self.cache_rows)
+
+    @property
+    def shape(self):
+        return self.size, self.size
+
+    @property
+    def dtype(self):
+        return array_dtype(self.__dtype)
+
+    @property
+    def nbytes(self):
+        return self.points.nbytes + len(self.__rows) * self.size * self.dtype.itemsize
@@ -0,0 +1,81 @@
+from math import inf
+from time import perf_counter
+
+
+class IncumbentRecorder:
+    """
+    Solution callback keeping the incumbent a search had at each time checkpoint.
+
+    Routes are only read from the model when the objective improves, and only the incumbent
+    of each checkpoint is kept, so a sweep up to days of search holds one tour per checkpoint
+    instead of one per improvement. A checkpoint is frozen with the latest incumbent found
+    before it, which is what a separate run with that time limit would have returned. When the
+    model cost is not the objective, as with penalized non-candidate arcs, objective_function
+    turns the routes of each incumbent into the objective that is recorded, while incumbents are
+    still chosen on the model cost the search minimizes.
+    """
+    routing = None
+    manager = None
+    num_vehicles: int = None
+    checkpoints: list = None
+    improvements: list = None
+    checkpoint_incumbents: dict = None
+    objective_function = None
+    __incumbent = None
+    __incumbent_cost = None
+    __start_time = None
+
+    def __init__(self, routing, manager, num_vehicles, checkpoints, objective_function=None):
+        self.routing = routing
+        self.manager = manager
+        self.num_vehicles = num_vehicles
+        self.checkpoints = sorted(checkpoints)
+        self.improvements = []
+        self.checkpoint_incumbents = {}
+        self.objective_function = objective_function
+
+    def start(self):
+        self.__start_time = perf_counter()
+
+    def __call__(self):
+        seconds = perf_counter() - self.__start_time
+        cost = self.routing.CostVar().Value()
+
+        if self.__incumbent_cost is not None and cost >= self.__incumbent_cost:
+            return
+
+        self.__freeze_checkpoints(until=seconds)
+        routes = self.current_routes(routing=self.routing, manager=self.manager, num_vehicles=self.num_vehicles)
+        self.__incumbent_cost = cost
+        self.__incumbent = {
+            'seconds': seconds,
+            'objective': self.objective_function(routes) if self.objective_function is not None else cost,
+            'routes': routes
+        }
+        self.improvements.append((seconds, self.__incumbent['objective']))
+
+    def finish(self):
+        self.__freeze_checkpoints(until=inf)
+        return self.checkpoint_incumbents
+
+    def __freeze_checkpoints(self, until):
+        for checkpoint in self.checkpoints:
+            if checkpoint < until and checkpoint not in self.checkpoint_incumbents:
+                self.checkpoint_incumbents[checkpoint] = self.__incumbent
+
+    @staticmethod
+    def current_routes(routing, manager, num_vehicles):
+        """Routes of the solution being reported, only readable from inside a solution callback."""
+        routes = []
+
+        for vehicle_id in range(num_vehicles):
+            index = routing.Start(vehicle_id)
+            route = [manager.IndexToNode(index)]
+
+            while not routing.IsEnd(index):
+                index = routing.NextVar(index).Value()
+                route.append(manager.IndexToNode(index))
+
+            routes.append(route)
+
+        return routes
@@ -0,0 +1,142 @@
+from hashlib import blake2b
+from json import dump, dumps, load
+from os import listdir, makedirs, replace
+from os.path import basename, dirname, exists, join, splitext
+from shutil import rmtree
+
+from numpy import asarray, int64, load as load_array, save as save_array
+
+
+class InstanceCache:
+    """
+    Binary cache of a parsed instance, stored next to the instance file.
+
+    Every entry lives on its own directory, named after the instance and a key built from the
+    content hash of the instance file plus the parse parameters, so editing the file or
+    changing how it is parsed invalidates the entry automatically. Storing an entry removes the
+    ones left by older versions of the file under the same parse parameters, while entries of
+    other parse parameters are kept, each one is built once. Arrays are stored as .npy
+    files and loaded memory-mapped, so a warm load does not copy the distance matrix.
+    """
+    CACHE_FORMAT_VERSION = 3
+    HASH_CHUNK_SIZE = 1 << 20
+
+    file_path: str = None
+    parse_parameters: dict = None
+    cache_directory: str = None
+    __key = None
+
+    def __init__(self, file_path: str, parse_parameters: dict):
+        self.file_path = file_path
+        self.parse_parameters = parse_parameters
+        self.cache_directory = join(dirname(file_path), 'cache')
+
+    @property
+    def key(self):
+        if self.__key is None:
+            digest = blake2b(digest_size=16)
+
+            with open(file=self.file_path, mode='rb') as instance_file:
+                for chunk in iter(lambda: instance_file.read(self.HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+
+            digest.update(dumps(
+                {'version': self.CACHE_FORMAT_VERSION, **self.parse_parameters},
+                sort_keys=True
+            ).encode())
+            self.__key = digest.hexdigest()
+
+        return self.__key
+
+    @property
+    def instance_name(self):
+        return splitext(basename(self.file_path))[0]
+
+    @property
+    def entry_directory(self):
+        return join(self.cache_directory, f'{self.instance_name}_{self.key}')
+
+    def load(self):
+        if not exists(join(self.entry_directory, 'metadata.json')):
+            return None
+
+        with open(file=join(self.entry_directory, 'metadata.json'), mode='r') as metadata_file:
+            metadata = load(metadata_file)
+
+        distance_matrix = None
+
+        if metadata['storage_mode'] != 'lazy':
+            distance_matrix = load_array(join(self.entry_directory, 'distance_matrix.npy'), mmap_mode='r')
+
+        return {
+            'distance_matrix': distance_matrix,
+            'points_matrix': load_array(join(self.entry_directory, 'points_matrix.npy'), mmap_mode='r'),
+            'max_route': metadata['max_route'],
+            'storage_mode': metadata['storage_mode']
+        }
+
+    def store(self, distance_matrix, points_matrix, max_route, storage_mode='full'):
+        makedirs(self.cache_directory, exist_ok=True)
+        temporary_directory = self.entry_directory + '.tmp'
+
+        if exists(temporary_directory):
+            rmtree(temporary_directory)
+
+        makedirs(temporary_directory)
+
+        if distance_matrix is not None:
+            save_array(join(temporary_directory, 'distance_matrix.npy'), distance_matrix)
+
+        save_array(join(temporary_directory, 'points_matrix.npy'), asarray(points_matrix, dtype=int64).reshape(-1, 2))
+
+        with open(file=join(temporary_directory, 'metadata.json'), mode='w') as metadata_file:
+            dump(
+                {
+                    'instance_name': self.instance_name,
+                    'key': self.key,
+                    'max_route': max_route,
+                    'storage_mode': storage_mode,
+                    'parse_parameters': self.parse_parameters
+                },
+                metadata_file
+            )
+
+        self.__remove_stale_entries()
+        replace(temporary_directory, self.entry_directory)
+
+    def load_array(self, name):
+        array_path = join(self.entry_directory, f'{name}.npy')
+
+        if not exists(array_path):
+            return None
+
+        return load_array(array_path, mmap_mode='r')
+
+    def store_array(self, name, values):
+        if not exists(self.entry_directory):
+            return
+
+        array_path = join(self.entry_directory, f'{name}.npy')
+
+        with open(file=array_path + '.tmp', mode='wb') as array_file:
+            save_array(array_file, values)
+
+        replace(array_path + '.tmp', array_path)
+
+    def __remove_stale_entries(self):
+        # only entries of this instance parsed the same way are stale, other parse parameters stay usable
+        parse_parameters = dumps(self.parse_parameters, sort_keys=True)
+
+        for entry in listdir(self.cache_directory):
+            entry_path = join(self.cache_directory, entry)
+            metadata_path = join(entry_path, 'metadata.json')
+
+            if entry.endswith('.tmp') or entry == basename(self.entry_directory) or not exists(metadata_path):
+                continue
+
+            with open(file=metadata_path, mode='r') as metadata_file:
+                metadata = load(metadata_file)
+
+            if metadata.get('instance_name') == self.instance_name \
+                    and dumps(metadata.get('parse_parameters'), sort_keys=True) == parse_parameters:
+                rmtree(entry_path)
@@ -1,4 +1,13 @@
 from math import sqrt
+from os.path import getsize
+from re import search
+from time import perf_counter
+
+from numpy import array, float64, fromstring, int64, rint, sqrt as array_sqrt, zeros
+
+from com.utils.distanceMatrix import DistanceMatrix, SymmetricDistanceMatrix
+from com.utils.distanceOracle import LazyDistanceOracle
+from com.utils.instanceCache import InstanceCache
 
 
 class Matrix:
@@ -10,15 +19,34 @@ class Matrix:
     coordinates_type = None
     calc_dist_type = None
     max_route = None
-
-    def __init__(self, rows_size, columns_size, matrix_type, coordinates_type, calc_dist_type):
+    block_size = None
+    load_statistics = None
+    loaded_from_cache = None
+    storage_mode = None
+    lazy_cache_rows = None
+    instance_cache = None
+
+    def __init__(
+            self,
+            rows_size,
+            columns_size,
+            matrix_type,
+            coordinates_type,
+            calc_dist_type,
+            block_size=512,
+            storage_mode='auto',
+            lazy_cache_rows=1024
+    ):
         self.rows_size = rows_size
         self.columns_size = columns_size
         self.matrix_type = matrix_type
         self.coordinates_type = coordinates_type
         self.calc_dist_type = calc_dist_type
+        self.block_size = block_size
+        self.storage_mode = storage_mode
+        self.lazy_cache_rows = lazy_cache_rows
         self.points_matrix = []
-        self.matrix = [[0 for col in range(columns_size)] for row in range(rows_size)]
+        self.matrix = None
 
     @staticmethod
     def calc_euclid_dist(x0, x1, y0, y1):
@@ -27,7 +55,35 @@ class Matrix:
 
         return round(sqrt(xd * xd + yd * yd))
 
-    def build_matrix(self, file_path):
+    @staticmethod
+    def calc_euclid_dist_block(x0, x1, y0, y1):
+        xd = x0[:, None] - x1[None, :]
+        yd = y0[:, None] - y1[None, :]
+
+        # rint rounds half to even, exactly like the builtin round used by calc_euclid_dist
+        return rint(array_sqrt(xd * xd + yd * yd)).astype(int64)
+
+    def build_matrix(self, file_path, use_cache=False):
+        self.instance_cache = None
+        self.loaded_from_cache = False
+
+        if use_cache:
+            self.instance_cache = InstanceCache(
+                file_path=file_path,
+                parse_parameters={
+                    'rows_size': self.rows_size,
+                    'columns_size': self.columns_size,
+                    'matrix_type': self.matrix_type.casefold(),
+                    'coordinates_type': self.coordinates_type.casefold(),
+                    'calc_dist_type': self.calc_dist_type.casefold() if self.calc_dist_type else None,
+                    'storage_mode': self.storage_mode.casefold()
+                }
+            )
+
+            if self.load_from_cache(instance_cache=self.instance_cache):
+                self.loaded_from_cache = True
+                return
+
         if self.matrix_type.casefold() == 'tsplib':
             self.make_points_matrix_from_a_file(
                 file_path=file_path,
@@ -42,24 +98,132 @@ class Matrix:
                 coord_type=self.coordinates_type
             )
 
+        if self.instance_cache is not None:
+            self.instance_cache.store(
+                distance_matrix=None if isinstance(self.matrix, LazyDistanceOracle) else self.matrix.values,
+                points_matrix=self.points_matrix,
+                max_route=self.max_route,
+                storage_mode=self.classify_stored_storage_mode()
+            )
+            self.load_from_cache(instance_cache=self.instance_cache)
+
+    def load_from_cache(self, instance_cache):
+        cached_instance = instance_cache.load()
+
+        if cached_instance is None:
+            return False
+
+        distance_matrix = cached_instance['distance_matrix']
+        self.points_matrix = cached_instance['points_matrix']
+        self.max_route = cached_instance['max_route']
+
+        if cached_instance['storage_mode'] == 'lazy':
+            self.matrix = self.make_lazy_distance_oracle()
+        elif cached_instance['storage_mode'] == 'symmetric':
+            self.matrix = SymmetricDistanceMatrix(distance_matrix, size=self.rows_size, dtype=distance_matrix.dtype)
+        else:
+            self.matrix = DistanceMatrix(distance_matrix, dtype=distance_matrix.dtype)
+
+        return True
+
+    def classify_stored_storage_mode(self):
+        if isinstance(self.matrix, LazyDistanceOracle):
+            return 'lazy'
+        if isinstance(self.matrix, SymmetricDistanceMatrix):
+            return 'symmetric'
+
+        return 'full'
+
     def classify_dist_calc(self, x0, x1, y0, y1):
         if self.calc_dist_type.casefold() == 'euclidean':
             return self.calc_euclid_dist(x0=x0, x1=x1, y0=y0, y1=y1)
 
+    def classify_dist_calc_block(self, x0, x1, y0, y1):
+        if self.calc_dist_type.casefold() == 'euclidean':
+            return self.calc_euclid_dist_block(x0=x0, x1=x1, y0=y0, y1=y1)
+
+    def distance_blocks(self, block_size=None):
+        if block_size is None:
+            block_size = self.block_size
+
+        points = array(self.points_matrix, dtype=float64)
+        xs = points[:self.columns_size, 0]
+        ys = points[:self.columns_size, 1]
+
+        for start in range(0, self.rows_size, block_size):
+            end = min(start + block_size, self.rows_size)
+            block = self.classify_dist_calc_block(
+                x0=points[start:end, 0],
+                x1=xs,
+                y0=points[start:end, 1],
+                y1=ys
+            )
+
+            yield start, end, block
+
+    def max_distance_bound(self):
+        points = array(self.points_matrix, dtype=float64)
+        xd, yd = points.max(axis=0) - points.min(axis=0)
+
+        return self.calc_euclid_dist(x0=xd, x1=0, y0=yd, y1=0) + 1
+
     def construct_distance_matrix_from_points_matrix(self):
-        for i in range(self.rows_size):
-            self.matrix[i][i] = 0
+        if self.storage_mode.casefold() == 'lazy':
+            self.matrix = self.make_lazy_distance_oracle()
+            return
+
+        dtype = DistanceMatrix.narrowest_dtype(minimum=0, maximum=self.max_distance_bound())
+
+        if self.storage_mode.casefold() != 'full' and self.rows_size == self.columns_size:
+            self.construct_symmetric_distance_matrix_from_points_matrix(dtype=dtype)
+            return
+
+        values = zeros((self.rows_size, self.columns_size), dtype=dtype)
+
+        for start, end, block in self.distance_blocks():
+            if block is not None:
+                values[start:end] = block
+
+        self.matrix = DistanceMatrix(values, dtype=dtype)
 
-            for j in range(i + 1, self.columns_size):
-                distance = self.classify_dist_calc(
-                    x0=self.points_matrix[i][0],
-                    x1=self.points_matrix[j][0],
-                    y0=self.points_matrix[i][1],
-                    y1=self.points_matrix[j][1]
-                )
+    def construct_symmetric_distance_matrix_from_points_matrix(self, dtype):
+        packed_values = zeros(SymmetricDistanceMatrix.packed_length(self.rows_size), dtype=dtype)
 
-                self.matrix[i][j] = distance
-                self.matrix[j][i] = distance
+        for start, end, block in self.distance_blocks():
+            if block is None:
+                continue
+
+            for i in range(start, end):
+                offset = SymmetricDistanceMatrix.row_offset(i, self.rows_size)
+                packed_values[offset + i:offset + self.rows_size] = block[i - start, i:]
+
+        self.matrix = SymmetricDistanceMatrix(packed_values, size=self.rows_size, dtype=dtype)
+
+    def make_lazy_distance_oracle(self):
+        if self.calc_dist_type is None or self.calc_dist_type.casefold() != 'euclidean':
+            raise ValueError('Lazy storage needs coordinates and an euclidean distance calculation')
+
+        return LazyDistanceOracle(
+            points=array(self.points_matrix, dtype=float64)[:self.rows_size],
+            distance_block=self.calc_euclid_dist_block,
+            dtype=DistanceMatrix.narrowest_dtype(minimum=0, maximum=self.max_distance_bound()),
+            cache_rows=self.lazy_cache_rows
+        )
+
+    def classify_storage(self, values):
+        if self.storage_mode.casefold() == 'lazy':
+            raise ValueError('Lazy storage is only available for coordinates instances')
+
+        if self.storage_mode.casefold() == 'full':
+            return DistanceMatrix(values)
+
+        if DistanceMatrix.is_symmetric(values, block_size=self.block_size):
+            return SymmetricDistanceMatrix.from_full(values)
+
+        if self.storage_mode.casefold() == 'symmetric':
+            raise ValueError('Symmetric storage requested for an asymmetric distance matrix')
+
+        return DistanceMatrix(values)
 
     def make_points_matrix_from_a_file(self, file_path, coord_type):
         points_file = open(file=file_path, mode='r')
@@ -73,43 +237,58 @@ class Matrix:
             self.points_matrix.append(row)
 
     def load_points_and_distance_matrices_from_a_file(self, file_path, coord_type):
-        distances_flag = False
-        points_flag = False
-        i = 0
-        j = 0
-
-        info_file = open(file=file_path, mode='r')
-
-        for line in info_file:
-            if 'MAX_ALLOWED_ROUTE' in line:
-                aux = line.split(':')
-                self.max_route = int(aux[1])
-
-            if distances_flag and i < self.rows_size:
-                if j >= self.columns_size:
-                    j = 0
-                    i += 1
-                else:
-                    self.matrix[i][j] = int(line)
-                    j += 1
-
-            if points_flag:
-                coordinates = self.split_coordinates_improved(
-                    string=line,
-                    coord_type=coord_type
-                )
-                row = [coordinates[1], coordinates[2]]
-                self.points_matrix.append(row)
-
-                if coordinates[0] == self.rows_size - 1:
-                    points_flag = False
-
-            if 'EDGE_WEIGHT_SECTION' in line:
-                distances_flag = True
-
-            if 'DISPLAY_DATA_SECTION' in line:
-                distances_flag = False
-                points_flag = True
+        start_time = perf_counter()
+
+        with open(file=file_path, mode='r') as info_file:
+            content = info_file.read()
+
+        distances_offset = content.find('EDGE_WEIGHT_SECTION')
+        points_offset = content.find('DISPLAY_DATA_SECTION')
+        depot_offset = content.find('DEPOT_SECTION')
+
+        if distances_offset < 0 or points_offset < 0:
+            raise ValueError(f'File {file_path} has no EDGE_WEIGHT_SECTION or DISPLAY_DATA_SECTION')
+
+        if depot_offset < 0:
+            depot_offset = len(content)
+
+        max_route = search(r'MAX_ALLOWED_ROUTE\s*:\s*(\d+)', content[:distances_offset])
+        if max_route is not None:
+            self.max_route = int(max_route.group(1))
+
+        # fromstring with an explicit count allocates the whole buffer once and converts
+        # every weight of the section in a single C pass
+        weights_count = self.rows_size * self.columns_size
+        weights = fromstring(
+            content[distances_offset + len('EDGE_WEIGHT_SECTION'):points_offset],
+            dtype=int64,
+            count=weights_count,
+            sep=' '
+        )
+        distances = weights.reshape(self.rows_size, self.columns_size)
+
+        points = fromstring(
+            content[points_offset + len('DISPLAY_DATA_SECTION'):depot_offset],
+            dtype=int64 if coord_type.casefold() == 'int' else float64,
+            sep=' '
+        ).reshape(-1, 3)[:self.rows_size, 1:]
+
+        if coord_type.casefold() != 'int':
+            points = rint(points).astype(int64)
+
+        self.matrix = self.classify_storage(values=distances)
+        self.points_matrix = points.tolist()
+
+        elapsed_seconds = perf_counter() - start_time
+        file_megabytes = getsize(file_path) / 1000000
+        self.load_statistics = {
+            'file_megabytes': file_megabytes,
+            'rows': self.rows_size,
+            'values': weights_count,
+            'seconds': elapsed_seconds,
+            'megabytes_per_second': file_megabytes / elapsed_seconds if elapsed_seconds > 0 else None,
+            'rows_per_second': self.rows_size / elapsed_seconds if elapsed_seconds > 0 else None
+        }
 
     def split_coordinates_improved(self, string, coord_type):
         splitted_coordinate = []
@@ -0,0 +1,71 @@
+from os import getcwd
+from os.path import dirname, exists
+from random import randrange
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+
+from com.utils.matrix import Matrix
+
+
+def traced_megabytes(builder):
+    start()
+    before, _ = get_traced_memory()
+    result = builder()
+    after, _ = get_traced_memory()
+    stop()
+
+    return result, (after - before) / 1000000
+
+
+def lookups_per_second(matrix, size, lookups=1000000):
+    pairs = [(randrange(size), randrange(size)) for _ in range(lookups)]
+
+    start_time = perf_counter()
+    for i, j in pairs:
+        matrix[i][j]
+
+    return lookups / (perf_counter() - start_time)
+
+
+if __name__ == '__main__':
+    instances = [
+        ('rio_claro', 'rio_claro_2000', 2001, 'int', None),
+        ('real_world', 'real_world_2000', 2001, 'int', None),
+        ('tsplib', 'pr2392', 2392, 'scientific_notation', 'EUCLIDEAN'),
+    ]
+
+    for matrix_type, problem_name, size, coordinates_type, calc_dist_type in instances:
+        local_file_path = r"{}\{}\files\{}\{}.txt".format(
+            dirname(getcwd()),
+            matrix_type,
+            problem_name,
+            problem_name
+        )
+
+        if not exists(local_file_path):
+            print(f'Skipping {problem_name}, file {local_file_path} not found')
+            continue
+
+        matrix = Matrix(
+            rows_size=size,
+            columns_size=size,
+            matrix_type=matrix_type,
+            coordinates_type=coordinates_type,
+            calc_dist_type=calc_dist_type
+        )
+        matrix.build_matrix(file_path=local_file_path)
+
+        list_of_lists, list_of_lists_megabytes = traced_megabytes(lambda: matrix.matrix.tolist())
+        compact_megabytes = matrix.matrix.nbytes / 1000000
+
+        # storage_mode 'auto' packs symmetric instances, the label names the storage actually measured
+        compact_label = f'{matrix.matrix.dtype} {type(matrix.matrix).__name__}:'
+
+        print(f'{problem_name} ({size}x{size})')
+        print(f'    {"list of lists:":36}{list_of_lists_megabytes:10.2f} MB, '
+              f'{lookups_per_second(list_of_lists, size):12.0f} lookups/s')
+        print(f'    {compact_label:36}{compact_megabytes:10.2f} MB, '
+              f'{lookups_per_second(matrix.matrix, size):12.0f} lookups/s')
+        print(f'    {"reduction:":36}{list_of_lists_megabytes / compact_megabytes:10.1f}x')
+
+        del list_of_lists
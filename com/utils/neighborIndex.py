@@ -0,0 +1,131 @@
+from math import ceil, sqrt
+
+from numpy import arange, argpartition, argsort, asarray, concatenate, empty, float64, floor, inf, int32, int64, \
+    lexsort, searchsorted, unique
+
+from com.utils.distanceMatrix import DistanceMatrix
+
+
+class NeighborIndex:
+    """
+    k nearest neighbors of every node, used as candidate lists for the routing search.
+
+    Coordinates instances are indexed with a uniform grid, so each node only ranks the points of
+    the cells around it. Explicit instances rank every row of the distance matrix, one block at a
+    time. The lists are stored on the instance cache when one is given, so they are built once
+    per instance and k.
+    """
+    k: int = None
+    neighbors = None
+
+    def __init__(self, k, distance_matrix=None, points=None, instance_cache=None, block_size=512):
+        self.k = k
+        cache_name = f'neighbors_{k}'
+
+        if instance_cache is not None:
+            self.neighbors = instance_cache.load_array(name=cache_name)
+
+        if self.neighbors is None:
+            if points is not None:
+                self.neighbors = self.grid_neighbors(points=points, k=k)
+            else:
+                self.neighbors = self.matrix_neighbors(distance_matrix=distance_matrix, k=k, block_size=block_size)
+
+            if instance_cache is not None:
+                instance_cache.store_array(name=cache_name, values=self.neighbors)
+
+    @staticmethod
+    def matrix_neighbors(distance_matrix, k, block_size=512):
+        size = len(distance_matrix)
+        k = min(k, size - 1)
+        neighbors = empty((size, k), dtype=int32)
+
+        for start in range(0, size, block_size):
+            end = min(start + block_size, size)
+
+            if isinstance(distance_matrix, DistanceMatrix):
+                block = distance_matrix.values[start:end].astype(float64)
+            else:
+                block = asarray([distance_matrix[row] for row in range(start, end)], dtype=float64)
+
+            block[arange(end - start), arange(start, end)] = inf
+            candidates = argpartition(block, k - 1, axis=1)[:, :k]
+            candidate_distances = block[arange(end - start)[:, None], candidates]
+            neighbors[start:end] = candidates[arange(end - start)[:, None], argsort(candidate_distances, axis=1)]
+
+        return neighbors
+
+    @staticmethod
+    def grid_neighbors(points, k):
+        points = asarray(points, dtype=float64)
+        size = len(points)
+        k = min(k, size - 1)
+
+        lower_corner = points.min(axis=0)
+        extent = points.max(axis=0) - lower_corner
+        cell_size = max(sqrt(extent[0] * extent[1] * 2 / size), extent.max() / size, 1e-9)
+        columns, rows = (floor(extent / cell_size).astype(int64) + 1).tolist()
+
+        cells = floor((points - lower_corner) / cell_size).astype(int64)
+        cell_ids = cells[:, 1] * columns + cells[:, 0]
+        order = argsort(cell_ids, kind='stable')
+        sorted_cell_ids = cell_ids[order]
+        cell_starts = searchsorted(sorted_cell_ids, arange(columns * rows + 1))
+
+        neighbors = empty((size, k), dtype=int32)
+
+        for node in range(size):
+            cell_column, cell_row = cells[node].tolist()
+            ring = 0
+
+            while True:
+                candidates = NeighborIndex.__cells_candidates(
+                    order, cell_starts, columns, rows, cell_column, cell_row, ring
+                )
+
+                if len(candidates) > k or (ring > columns and ring > rows):
+                    break
+
+                ring += 1
+
+            candidate_distances = NeighborIndex.__squared_distances(points, node, candidates)
+            kth_distance = sqrt(candidate_distances[argpartition(candidate_distances, k)[k]])
+            covering_ring = int(ceil(kth_distance / cell_size))
+
+            if covering_ring > ring:
+                candidates = NeighborIndex.__cells_candidates(
+                    order, cell_starts, columns, rows, cell_column, cell_row, covering_ring
+                )
+                candidate_distances = NeighborIndex.__squared_distances(points, node, candidates)
+
+            candidate_distances[candidates == node] = inf
+            nearest = lexsort((candidates, candidate_distances))[:k]
+            neighbors[node] = candidates[nearest]
+
+        return neighbors
+
+    @staticmethod
+    def __cells_candidates(order, cell_starts, columns, rows, cell_column, cell_row, ring):
+        first_column, last_column = max(cell_column - ring, 0), min(cell_column + ring, columns - 1)
+        first_row, last_row = max(cell_row - ring, 0), min(cell_row + ring, rows - 1)
+
+        return concatenate([
+            order[cell_starts[row * columns + first_column]:cell_starts[row * columns + last_column + 1]]
+            for row in range(first_row, last_row + 1)
+        ])
+
+    @staticmethod
+    def __squared_distances(points, node, candidates):
+        differences = points[candidates] - points[node]
+        return (differences * differences).sum(axis=1)
+
+    def symmetric_candidates(self):
+        """Candidate set of every node, closed under symmetry: j is a candidate of i if either is a neighbor of the other."""
+        size = len(self.neighbors)
+        sources = concatenate([arange(size).repeat(self.neighbors.shape[1]), self.neighbors.ravel()])
+        targets = concatenate([self.neighbors.ravel(), arange(size).repeat(self.neighbors.shape[1])])
+        arcs = unique(sources.astype(int64) * size + targets)
+        arc_sources = arcs // size
+        arc_starts = searchsorted(arc_sources, arange(size + 1))
+
+        return [(arcs[arc_starts[node]:arc_starts[node + 1]] % size).tolist() for node in range(size)]
@@ -1,16 +1,37 @@
+from concurrent.futures import as_completed, ProcessPoolExecutor
 from datetime import datetime
-from logging import basicConfig, INFO, getLogger
-from os import getcwd
-from os.path import dirname
+from logging import basicConfig, FileHandler, Formatter, INFO, getLogger
+from multiprocessing import get_context
+from os import cpu_count, getcwd
+from os.path import dirname, exists
+from time import perf_counter
 
-from matplotlib import pyplot
+from numpy import asarray, int32
 from pytz import timezone
 from ortools.constraint_solver import pywrapcp, routing_enums_pb2
 
+from com.utils.convergenceTrace import ConvergenceTrace
+from com.utils.distanceOracle import LazyDistanceOracle
+from com.utils.incumbentRecorder import IncumbentRecorder
 from com.utils.matrix import Matrix
+from com.utils.neighborIndex import NeighborIndex
+from com.utils.phaseProfiler import PhaseProfiler
+from com.utils.renderQueue import RenderQueue
+from com.utils.routeExporter import RouteExporter
+from com.utils.routeImprover import RouteImprover
+from com.utils.routeLoader import RouteLoader
+from com.utils.routePlotter import RoutePlotter
+from com.utils.searchCheckpoint import SearchCheckpoint
+from com.utils.searchPortfolio import SearchPortfolio
+from com.utils.tourEvaluator import TourEvaluator
+from com.utils.tourPolisher import TourPolisher
+from com.utils.sharedDistanceMatrix import SharedDistanceMatrix
+from com.utils.transitEvaluator import TransitEvaluator
 
 
 class OrToolsVRPSolver:
+    FIRST_SOLUTION_STRATEGIES = ['GLOBAL_CHEAPEST_ARC', 'PATH_CHEAPEST_ARC']
+
     problem_name: str = None
     matrix_rows_size: int = None
     matrix_columns_size: int = None
@@ -26,12 +47,41 @@ class OrToolsVRPSolver:
     dpi_on_image_solution: int = None
     marker_size_on_image_solution: float = None
     line_width_on_image_solution: float = None
+    transit_evaluator: str = None
+    neighbor_candidates: int = None
+    non_candidate_arc_penalty: int = None
+    use_instance_cache: bool = None
+    matrix_storage_mode: str = None
+    parallel_strategies: bool = None
+    portfolio_size: int = None
+    time_limit_checkpoints: list = None
+    convergence_trace: str = None
+    initial_routes = None
+    checkpoint_interval_seconds: float = None
+    resumed_search_seconds: float = None
+    profiler_mode: str = None
+    background_rendering: bool = None
+    route_export: str = None
+    polish_solutions: bool = None
+    polish_neighbors: int = None
+    improve_routes: bool = None
+    results: dict = None
+    phase_profiler: PhaseProfiler = None
+    instance_load_seconds: float = None
+    instance_loaded_from_cache: bool = None
     __logger = None
     __file_name = None
     __common_directory = None
     __model_data = None
     __manager = None
     __routing = None
+    __solution_callbacks = None
+    __transit_evaluator = None
+    __candidate_nodes = None
+    __shared_distance_matrix = None
+    __render_queue = None
+    __tour_polisher = None
+    __route_improver = None
 
     def __init__(
             self,
@@ -49,7 +99,25 @@ class OrToolsVRPSolver:
             log_search_on_terminal: bool = True,
             dpi_on_image_solution: int = 1200,
             marker_size_on_image_solution: float = 7,
-            line_width_on_image_solution: float = 2
+            line_width_on_image_solution: float = 2,
+            transit_evaluator: str = 'callback',
+            neighbor_candidates: int = None,
+            non_candidate_arc_penalty: int = None,
+            use_instance_cache: bool = True,
+            matrix_storage_mode: str = 'auto',
+            parallel_strategies: bool = False,
+            portfolio_size: int = None,
+            time_limit_checkpoints: list = None,
+            convergence_trace: str = None,
+            initial_routes=None,
+            checkpoint_interval_seconds: float = None,
+            resumed_search_seconds: float = 0,
+            profiler_mode: str = None,
+            background_rendering: bool = True,
+            route_export: str = 'jsonl',
+            polish_solutions: bool = False,
+            polish_neighbors: int = 10,
+            improve_routes: bool = False
     ):
         if strategies is None:
             strategies = ['GLOBAL_CHEAPEST_ARC']
@@ -69,18 +137,97 @@ class OrToolsVRPSolver:
         self.dpi_on_image_solution = dpi_on_image_solution
         self.marker_size_on_image_solution = marker_size_on_image_solution
         self.line_width_on_image_solution = line_width_on_image_solution
+        self.transit_evaluator = transit_evaluator
+        self.neighbor_candidates = neighbor_candidates
+        self.non_candidate_arc_penalty = non_candidate_arc_penalty
+        self.use_instance_cache = use_instance_cache
+        self.matrix_storage_mode = matrix_storage_mode
+        self.parallel_strategies = parallel_strategies
+        self.portfolio_size = portfolio_size if portfolio_size is not None else cpu_count()
+        self.time_limit_checkpoints = sorted(time_limit_checkpoints) if time_limit_checkpoints is not None else None
+        self.convergence_trace = convergence_trace
+        self.initial_routes = initial_routes
+        self.checkpoint_interval_seconds = checkpoint_interval_seconds
+        self.resumed_search_seconds = resumed_search_seconds
+        self.profiler_mode = profiler_mode
+        self.background_rendering = background_rendering
+        self.route_export = route_export
+        self.polish_solutions = polish_solutions
+        self.polish_neighbors = polish_neighbors
+        self.improve_routes = improve_routes
+        self.results = {}
+
+        if self.time_limit_checkpoints is not None:
+            # a single run up to the longest checkpoint answers every shorter time limit as well
+            self.time_limit_seconds = self.time_limit_checkpoints[-1]
 
         self.__common_directory = dirname(getcwd())
         self.__file_name = f"vrp_{self.problem_name}_{datetime.now(timezone('America/Sao_Paulo'))}" \
             .replace(" ", "_").replace(".", "_").replace(":", "_")
         self.__setup_logger()
         self.__logger = getLogger()
-        self.__create_data_model()
-        self.__manager = pywrapcp.RoutingIndexManager(
-            len(self.__model_data['distance_matrix']),
-            self.__model_data['num_vehicles'],
-            self.__model_data['depot']
-        )
+        self.phase_profiler = PhaseProfiler(mode=self.profiler_mode)
+
+        with self.phase_profiler.phase('create_data_model'):
+            self.__create_data_model()
+
+        if self.neighbor_candidates is not None:
+            with self.phase_profiler.phase('build_candidate_nodes'):
+                self.__build_candidate_nodes()
+
+        self.__setup_transit_evaluator()
+
+        if isinstance(self.initial_routes, str) and self.initial_routes not in self.FIRST_SOLUTION_STRATEGIES:
+            with self.phase_profiler.phase('load_initial_routes'):
+                self.__load_initial_routes()
+
+    def __getstate__(self):
+        # the routing objects wrap C++ pointers, every worker rebuilds its own on __setstate__
+        state = self.__dict__.copy()
+
+        for attribute in [
+            'manager', 'render_queue', 'route_improver', 'routing', 'solution_callbacks', 'tour_polisher',
+            'transit_evaluator'
+        ]:
+            state.pop(f'_OrToolsVRPSolver__{attribute}', None)
+
+        if self.__shared_distance_matrix is not None:
+            state['_OrToolsVRPSolver__model_data'] = {**self.__model_data, 'distance_matrix': None}
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # phases timed in a worker start from scratch and go back to the parent with the result
+        self.phase_profiler = PhaseProfiler()
+
+        if self.__shared_distance_matrix is not None:
+            self.__model_data['distance_matrix'] = self.__shared_distance_matrix.attach()
+
+        self.__setup_transit_evaluator()
+
+    def __setup_transit_evaluator(self):
+        with self.phase_profiler.phase('routing_index_manager'):
+            self.__manager = pywrapcp.RoutingIndexManager(
+                len(self.__model_data['distance_matrix']),
+                self.__model_data['num_vehicles'],
+                self.__model_data['depot']
+            )
+
+        with self.phase_profiler.phase('transit_evaluator'):
+            self.__transit_evaluator = TransitEvaluator(
+                manager=self.__manager,
+                distance_matrix=self.__model_data['distance_matrix'],
+                evaluator=self.transit_evaluator
+            )
+
+        if self.__candidate_nodes is not None:
+            # arcs leaving or reaching the depot stay free, so every vehicle can still start and close its route
+            self.__transit_evaluator.penalize_non_candidate_arcs(
+                candidate_nodes=self.__candidate_nodes,
+                non_candidate_penalty=self.non_candidate_arc_penalty,
+                free_nodes=[self.__model_data['depot']]
+            )
 
     def __create_data_model(self):
         matrix = Matrix(
@@ -88,7 +235,8 @@ class OrToolsVRPSolver:
             columns_size=self.matrix_columns_size,
             matrix_type=self.matrix_type,
             coordinates_type=self.coordinates_type,
-            calc_dist_type=self.calc_dist_type
+            calc_dist_type=self.calc_dist_type,
+            storage_mode=self.matrix_storage_mode
         )
 
         local_file_path = r"{}\{}\files\{}\{}.txt".format(
@@ -98,18 +246,34 @@ class OrToolsVRPSolver:
             self.problem_name
         )
 
-        matrix.build_matrix(file_path=local_file_path)
+        start_time = perf_counter()
+
+        with self.phase_profiler.phase('build_matrix'):
+            matrix.build_matrix(file_path=local_file_path, use_cache=self.use_instance_cache)
+
+        self.instance_load_seconds = perf_counter() - start_time
+        self.instance_loaded_from_cache = matrix.loaded_from_cache
+
+        if matrix.loaded_from_cache:
+            self.__logger.info('Instance loaded from the binary cache')
+        elif matrix.load_statistics is not None:
+            self.__logger.info(
+                f"Instance loaded in {format(matrix.load_statistics['seconds'])} seconds "
+                f"({format(matrix.load_statistics['megabytes_per_second'])} MB/s, "
+                f"{format(matrix.load_statistics['rows_per_second'])} rows/s)"
+            )
 
         self.__model_data = {
             'distance_matrix': matrix.matrix,
             'num_vehicles': self.num_vehicles,
             'depot': 0,
             'points_matrix': matrix.points_matrix,
-            'max_route': matrix.max_route
+            'max_route': matrix.max_route,
+            'instance_cache': matrix.instance_cache
         }
 
     def __setup_logger(self):
-        if 'GUIDED_LOCAL_SEARCH' in self.strategies:
+        if 'GUIDED_LOCAL_SEARCH' in self.strategies or 'PORTFOLIO' in self.strategies:
             basicConfig(
                 filename=r"{}\{}\files\{}\logs\{}".format(
                     self.__common_directory,
@@ -134,86 +298,689 @@ class OrToolsVRPSolver:
                 format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
 
-    def __distance_callback(self, from_index, to_index):
-        from_node = self.__manager.IndexToNode(from_index)
-        to_node = self.__manager.IndexToNode(to_index)
-        return self.__model_data['distance_matrix'][from_node][to_node]
+    def __load_initial_routes(self):
+        routes_file_path = self.initial_routes
+
+        if not exists(routes_file_path):
+            routes_file_path = r"{}\{}\files\{}\{}".format(
+                self.__common_directory,
+                self.matrix_type.casefold(),
+                self.problem_name,
+                self.initial_routes
+            )
+
+        self.initial_routes = RouteLoader.load(file_path=routes_file_path)
+        self.__logger.info(f'Initial routes loaded from {routes_file_path}')
 
-    def __prepare_solution(self):
+    def __build_candidate_nodes(self):
+        neighbor_index = NeighborIndex(
+            k=self.neighbor_candidates,
+            distance_matrix=self.__model_data['distance_matrix'],
+            points=self.__model_data['points_matrix'] if self.matrix_type.casefold() == 'tsplib' else None,
+            instance_cache=self.__model_data['instance_cache']
+        )
+        self.__candidate_nodes = neighbor_index.symmetric_candidates()
+
+        if self.non_candidate_arc_penalty is None:
+            self.non_candidate_arc_penalty = TransitEvaluator.default_non_candidate_penalty(
+                distance_matrix=self.__model_data['distance_matrix'],
+                depot=self.__model_data['depot']
+            )
+
+        self.__logger.info(
+            f'Arcs outside the {self.neighbor_candidates} nearest neighbors of every node penalized by '
+            f'{self.non_candidate_arc_penalty} ({sum(len(candidates) for candidates in self.__candidate_nodes)} candidate arcs)'
+        )
+        self.__logger.info('Objectives are computed from the route distances, without the non-candidate arc penalties')
+
+    def __build_routing_model(self):
+        # built once per solver, every strategy solved afterwards only brings its own search parameters
+        start_time = perf_counter()
         self.__routing = pywrapcp.RoutingModel(self.__manager)
-        __transit_callback_index = self.__routing.RegisterTransitCallback(self.__distance_callback)
-        self.__routing.SetArcCostEvaluatorOfAllVehicles(__transit_callback_index)
+        __transit_callback_index = self.__transit_evaluator.register(self.__routing)
+        self.__routing.SetArcCostEvaluatorOfAllVehicles(
+            self.__transit_evaluator.register_arc_cost(self.__routing, __transit_callback_index)
+        )
+
         self.__routing.AddDimension(
             __transit_callback_index,
             0,
-            int(self.__model_data['max_route'] * self.upper_limit_coefficient),
+            self.__max_route_distance(),
             True,
             self.dimension_name
         )
         distance_dimension = self.__routing.GetDimensionOrDie(self.dimension_name)
-        distance_dimension.SetGlobalSpanCostCoefficient(int((self.__model_data['max_route'] * self.upper_limit_coefficient)/10))
+        distance_dimension.SetGlobalSpanCostCoefficient(self.__span_cost_coefficient())
+
+        self.__solution_callbacks = []
+        self.__routing.AddAtSolutionCallback(self.__notify_solution_callbacks)
+
+        return perf_counter() - start_time
+
+    def __notify_solution_callbacks(self):
+        # callbacks added to the model would stay for every later solve, only the ones of the running solve are called
+        for solution_callback in self.__solution_callbacks:
+            solution_callback()
 
     def execute_strategies(self):
-        if 'GLOBAL_CHEAPEST_ARC' in self.strategies:
-            self.global_cheapest_arc()
+        strategies = [
+            strategy for strategy in ['GLOBAL_CHEAPEST_ARC', 'PATH_CHEAPEST_ARC', 'GUIDED_LOCAL_SEARCH']
+            if strategy in self.strategies
+        ]
+
+        if self.parallel_strategies and len(strategies) > 1:
+            with self.phase_profiler.phase('parallel_strategies'):
+                self.__execute_strategies_in_parallel(strategies=strategies)
+        else:
+            if 'GLOBAL_CHEAPEST_ARC' in self.strategies:
+                self.global_cheapest_arc()
+
+            if 'PATH_CHEAPEST_ARC' in self.strategies:
+                self.path_cheapest_arc()
+
+            if 'GUIDED_LOCAL_SEARCH' in self.strategies:
+                self.guided_local_search()
 
-        if 'PATH_CHEAPEST_ARC' in self.strategies:
-            self.path_cheapest_arc()
+        if 'PORTFOLIO' in self.strategies:
+            with self.phase_profiler.phase('PORTFOLIO'):
+                self.portfolio()
 
-        if 'GUIDED_LOCAL_SEARCH' in self.strategies:
-            self.guided_local_search()
+        self.wait_for_renders()
+        self.__log_phase_breakdown()
 
     def global_cheapest_arc(self):
-        self.__prepare_solution()
+        self.__execute_strategy(strategy='GLOBAL_CHEAPEST_ARC')
 
-        search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-        search_parameters.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.GLOBAL_CHEAPEST_ARC
+    def path_cheapest_arc(self):
+        self.__execute_strategy(strategy='PATH_CHEAPEST_ARC')
 
-        self.__logger.info(f'Start to solve problem with GLOBAL_CHEAPEST_ARC strategy')
-        solution = self.__routing.SolveWithParameters(search_parameters)
-        self.__logger.info(f'End to solve problem with GLOBAL_CHEAPEST_ARC strategy')
+    def guided_local_search(self):
+        self.__execute_strategy(strategy='GUIDED_LOCAL_SEARCH')
 
-        self.__log_solution(strategy='GLOBAL_CHEAPEST_ARC', solution=solution)
-        self.__plot_solution(strategy='GLOBAL_CHEAPEST_ARC', solution=solution)
+    def __execute_strategy(self, strategy):
+        with self.phase_profiler.phase(strategy):
+            self.__logger.info(f'Start to solve problem with {strategy} strategy')
+            result = self.solve_strategy(strategy=strategy)
+            self.__logger.info(f'End to solve problem with {strategy} strategy')
 
-    def path_cheapest_arc(self):
-        self.__prepare_solution()
+            self.__report_result(strategy=strategy, result=result)
 
-        search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-        search_parameters.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+    def __execute_strategies_in_parallel(self, strategies):
+        start_time = perf_counter()
 
-        self.__logger.info(f'Start to solve problem with PATH_CHEAPEST_ARC strategy')
-        solution = self.__routing.SolveWithParameters(search_parameters)
-        self.__logger.info(f'End to solve problem with PATH_CHEAPEST_ARC strategy')
+        for strategy in strategies:
+            self.__logger.info(f'Start to solve problem with {strategy} strategy')
 
-        self.__log_solution(strategy='PATH_CHEAPEST_ARC', solution=solution)
-        self.__plot_solution(strategy='PATH_CHEAPEST_ARC', solution=solution)
+        for strategy, result in self.__solve_in_workers(
+                solve='solve_strategy', tasks=strategies, max_workers=len(strategies)
+        ):
+            self.phase_profiler.merge(phases=result.pop('worker_phases'), label=f'{strategy} (worker)')
+            self.__logger.info(f'End to solve problem with {strategy} strategy')
+            self.__report_result(strategy=strategy, result=result)
 
-    def guided_local_search(self):
-        self.__prepare_solution()
+        self.__logger.info(
+            f'{len(strategies)} strategies solved in parallel in {format(perf_counter() - start_time)} seconds '
+            f'({format(sum(self.results[strategy]["solve_seconds"] for strategy in strategies))} seconds of solving)'
+        )
+
+    def portfolio(self):
+        configurations = SearchPortfolio.configurations(size=self.portfolio_size)
+        results = []
+
+        self.__logger.info(f'Start to solve problem with PORTFOLIO strategy ({len(configurations)} configurations)')
+
+        for configuration, result in self.__solve_in_workers(
+                solve='solve_configuration', tasks=configurations, max_workers=min(len(configurations), cpu_count())
+        ):
+            self.phase_profiler.merge(phases=result.pop('worker_phases'), label=f"{configuration['name']} (worker)")
+            results.append(result)
+            self.__log_convergence_trace(convergence_trace=result['convergence_trace'])
+            self.__logger.info(
+                f"Configuration {configuration['name']} (seed {configuration['random_seed']}): "
+                f"objective {result['objective']} in {format(result['solve_seconds'])} seconds"
+            )
+
+        self.__logger.info(f'End to solve problem with PORTFOLIO strategy')
+
+        best_result = min(results, key=lambda result: (result['objective'] is None, result['objective'] or 0))
 
+        if best_result['objective'] is not None:
+            self.__logger.info(f"Best solution achieved by configuration {best_result['configuration']['name']}")
+
+        self.__report_result(strategy='PORTFOLIO', result={**best_result, 'portfolio': results, 'convergence_trace': None})
+
+    def __solve_in_workers(self, solve, tasks, max_workers):
+        if not isinstance(self.__model_data['distance_matrix'], LazyDistanceOracle):
+            self.__shared_distance_matrix = SharedDistanceMatrix(distance_matrix=self.__model_data['distance_matrix'])
+
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context('spawn')) as executor:
+                futures = {executor.submit(self.solve_in_worker, solve, task): task for task in tasks}
+
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+        finally:
+            if self.__shared_distance_matrix is not None:
+                self.__shared_distance_matrix.release()
+                self.__shared_distance_matrix = None
+
+    def solve_in_worker(self, solve, task):
+        result = getattr(self, solve)(task)
+
+        return {**result, 'worker_phases': self.phase_profiler.phases}
+
+    def solve_strategy(self, strategy):
         search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-        search_parameters.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+
+        if strategy == 'GUIDED_LOCAL_SEARCH':
+            search_parameters.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+            search_parameters.time_limit.seconds = self.time_limit_seconds
+            search_parameters.log_search = self.log_search_on_terminal
+        else:
+            search_parameters.first_solution_strategy = getattr(routing_enums_pb2.FirstSolutionStrategy, strategy)
+
+        if strategy != 'GUIDED_LOCAL_SEARCH':
+            return self.__solve(search_parameters=search_parameters, trace_name=strategy)
+
+        return self.__solve(
+            search_parameters=search_parameters,
+            trace_name=strategy,
+            time_limit_checkpoints=self.time_limit_checkpoints,
+            initial_routes=self.__resolve_initial_routes(),
+            write_checkpoints=True
+        )
+
+    def solve_configuration(self, configuration):
+        search_parameters = SearchPortfolio.apply(
+            search_parameters=pywrapcp.DefaultRoutingSearchParameters(),
+            configuration=configuration
+        )
         search_parameters.time_limit.seconds = self.time_limit_seconds
-        search_parameters.log_search = self.log_search_on_terminal
 
-        self.__logger.info(f'Start to solve problem with GUIDED_LOCAL_SEARCH strategy')
-        solution = self.__routing.SolveWithParameters(search_parameters)
-        self.__logger.info(f'End to solve problem with GUIDED_LOCAL_SEARCH strategy')
+        return {
+            **self.__solve(
+                search_parameters=search_parameters,
+                trace_name=f"PORTFOLIO_{configuration['name']}",
+                random_seed=configuration['random_seed'],
+                initial_routes=self.__resolve_initial_routes()
+            ),
+            'configuration': configuration
+        }
+
+    def __solve(
+            self,
+            search_parameters,
+            trace_name,
+            random_seed=None,
+            time_limit_checkpoints=None,
+            initial_routes=None,
+            write_checkpoints=False
+    ):
+        model_build_seconds = None
+
+        if self.__routing is None:
+            with self.phase_profiler.phase('build_routing_model'):
+                model_build_seconds = self.__build_routing_model()
+
+        incumbent_recorder = None
+        convergence_trace = None
+        search_checkpoint = None
+        objective_function = self.__objective_function()
+        initial_assignment = None
+
+        if random_seed is not None:
+            self.__routing.solver().ReSeed(random_seed)
+
+        if time_limit_checkpoints is not None:
+            incumbent_recorder = IncumbentRecorder(
+                routing=self.__routing,
+                manager=self.__manager,
+                num_vehicles=self.__model_data['num_vehicles'],
+                checkpoints=time_limit_checkpoints,
+                objective_function=objective_function
+            )
+            self.__solution_callbacks.append(incumbent_recorder)
+            incumbent_recorder.start()
+
+        if self.convergence_trace is not None:
+            convergence_trace = ConvergenceTrace(
+                routing=self.__routing,
+                file_path=r"{}\{}\files\{}\logs\{}".format(
+                    self.__common_directory,
+                    self.matrix_type.casefold(),
+                    self.problem_name,
+                    (self.__file_name + "_" + trace_name + "_convergence"
+                     + (".csv" if self.convergence_trace == 'csv' else ".bin"))
+                ),
+                trace_format=self.convergence_trace,
+                manager=self.__manager,
+                num_vehicles=self.__model_data['num_vehicles'],
+                objective_function=objective_function
+            )
+            self.__solution_callbacks.append(convergence_trace)
+            convergence_trace.start()
+
+        if write_checkpoints and self.checkpoint_interval_seconds is not None:
+            search_checkpoint = SearchCheckpoint(
+                routing=self.__routing,
+                manager=self.__manager,
+                num_vehicles=self.__model_data['num_vehicles'],
+                file_path=r"{}\{}\files\{}\logs\{}".format(
+                    self.__common_directory,
+                    self.matrix_type.casefold(),
+                    self.problem_name,
+                    self.__file_name + "_" + trace_name + "_checkpoint.json"
+                ),
+                interval_seconds=self.checkpoint_interval_seconds,
+                metadata={
+                    'solver': type(self).__name__,
+                    'solver_parameters': self.__solver_parameters(),
+                    'strategy': trace_name,
+                    'time_limit_seconds': self.resumed_search_seconds + self.time_limit_seconds
+                },
+                resumed_search_seconds=self.resumed_search_seconds,
+                objective_function=objective_function
+            )
+            self.__solution_callbacks.append(search_checkpoint)
+            search_checkpoint.start()
+
+        if initial_routes is not None:
+            initial_assignment = self.__read_initial_assignment(
+                initial_routes=initial_routes,
+                search_parameters=search_parameters
+            )
+
+        start_time = perf_counter()
+
+        with self.phase_profiler.phase('solve'):
+            if initial_assignment is not None:
+                solution = self.__routing.SolveFromAssignmentWithParameters(initial_assignment, search_parameters)
+            else:
+                solution = self.__routing.SolveWithParameters(search_parameters)
+
+        solve_seconds = perf_counter() - start_time
+        self.__solution_callbacks.clear()
+
+        if convergence_trace is not None:
+            convergence_trace.close()
+
+        if search_checkpoint is not None:
+            search_checkpoint.finish()
+
+        routes = self.__extract_routes(solution=solution) if solution is not None else None
+        objective = None
+
+        if solution is not None:
+            objective = objective_function(routes) if objective_function is not None else solution.ObjectiveValue()
+
+        result = {
+            'objective': objective,
+            'routes': routes,
+            'route_distances': self.__route_distances(routes=routes) if routes is not None else None,
+            'solve_seconds': solve_seconds,
+            'model_build_seconds': model_build_seconds,
+            'warm_started': initial_assignment is not None,
+            'checkpoint_incumbents': incumbent_recorder.finish() if incumbent_recorder is not None else None,
+            'convergence_trace': {
+                'file_path': convergence_trace.file_path,
+                'improvements': convergence_trace.improvements,
+                'solutions': convergence_trace.solutions
+            } if convergence_trace is not None else None,
+            'checkpoint': {
+                'file_path': search_checkpoint.file_path,
+                'writes': search_checkpoint.writes
+            } if search_checkpoint is not None else None
+        }
+
+        if self.polish_solutions or self.improve_routes:
+            self.__improve_solutions(result=result)
+
+        return result
+
+    def __objective_function(self):
+        # penalties on non-candidate arcs only steer the search, the objective is taken from the route distances
+        if self.__candidate_nodes is None:
+            return None
+
+        return lambda routes: self.__route_cost(self.__route_distances(routes=routes))
+
+    def __solver_parameters(self):
+        # constructor arguments needed to rebuild this solver when resuming from a checkpoint
+        return {
+            'problem_name': self.problem_name,
+            'matrix_rows_size': self.matrix_rows_size,
+            'matrix_columns_size': self.matrix_columns_size,
+            'matrix_type': self.matrix_type,
+            'coordinates_type': self.coordinates_type,
+            'calc_dist_type': self.calc_dist_type,
+            'dimension_name': self.dimension_name,
+            'num_vehicles': self.num_vehicles,
+            'upper_limit_coefficient': self.upper_limit_coefficient,
+            'log_search_on_terminal': self.log_search_on_terminal,
+            'dpi_on_image_solution': self.dpi_on_image_solution,
+            'marker_size_on_image_solution': self.marker_size_on_image_solution,
+            'line_width_on_image_solution': self.line_width_on_image_solution,
+            'transit_evaluator': self.transit_evaluator,
+            'neighbor_candidates': self.neighbor_candidates,
+            'non_candidate_arc_penalty': self.non_candidate_arc_penalty,
+            'use_instance_cache': self.use_instance_cache,
+            'matrix_storage_mode': self.matrix_storage_mode,
+            'convergence_trace': self.convergence_trace,
+            'checkpoint_interval_seconds': self.checkpoint_interval_seconds,
+            'profiler_mode': self.profiler_mode,
+            'background_rendering': self.background_rendering,
+            'route_export': self.route_export,
+            'polish_solutions': self.polish_solutions,
+            'polish_neighbors': self.polish_neighbors,
+            'improve_routes': self.improve_routes
+        }
+
+    def __read_initial_assignment(self, initial_routes, search_parameters):
+        if len(initial_routes) > self.__model_data['num_vehicles']:
+            raise ValueError(
+                f"{len(initial_routes)} initial routes given for {self.__model_data['num_vehicles']} vehicles"
+            )
+
+        # the routing model expects indices without the start and end of each vehicle
+        routes = [
+            [self.__manager.NodeToIndex(int(node)) for node in route[1:-1]]
+            for route in initial_routes
+        ] + [[] for _ in range(self.__model_data['num_vehicles'] - len(initial_routes))]
+
+        self.__routing.CloseModelWithParameters(search_parameters)
+
+        return self.__routing.ReadAssignmentFromRoutes(routes, True)
 
-        self.__log_solution(strategy='GUIDED_LOCAL_SEARCH', solution=solution)
-        self.__plot_solution(strategy='GUIDED_LOCAL_SEARCH', solution=solution)
+    def __extract_routes(self, solution):
+        routes = []
 
-    def __log_solution(self, strategy, solution):
+        for vehicle_id in range(self.__model_data['num_vehicles']):
+            index = self.__routing.Start(vehicle_id)
+            route = [self.__manager.IndexToNode(index)]
+
+            while not self.__routing.IsEnd(index):
+                index = solution.Value(self.__routing.NextVar(index))
+                route.append(self.__manager.IndexToNode(index))
+
+            routes.append(asarray(route, dtype=int32))
+
+        return routes
+
+    def __route_distances(self, routes):
+        return self.__tour_evaluator().route_distances(routes=routes).tolist()
+
+    def __improve_solutions(self, result):
+        # the incumbent of every checkpoint is improved as well, each one is reported as a solution
+        solutions = [result] + [
+            incumbent for incumbent in (result['checkpoint_incumbents'] or {}).values() if incumbent is not None
+        ]
+
+        for solution in solutions:
+            if solution['routes'] is None:
+                continue
+
+            if self.improve_routes:
+                with self.phase_profiler.phase('improve_routes'):
+                    solution.update(self.__improve(objective=solution['objective'], routes=solution['routes']))
+            else:
+                with self.phase_profiler.phase('polish'):
+                    solution.update(self.__polish(objective=solution['objective'], routes=solution['routes']))
+
+    def __build_route_improvement(self):
+        # the polisher and the route improver share the neighbor lists, built on the first solution improved
+        with self.phase_profiler.phase('build_polish_neighbors'):
+            neighbor_index = NeighborIndex(
+                k=self.polish_neighbors,
+                distance_matrix=self.__model_data['distance_matrix'],
+                points=self.__model_data['points_matrix'] if self.matrix_type.casefold() == 'tsplib' else None,
+                instance_cache=self.__model_data['instance_cache']
+            )
+            self.__tour_polisher = TourPolisher(
+                distance_matrix=self.__model_data['distance_matrix'],
+                neighbors=neighbor_index.neighbors
+            )
+            self.__route_improver = RouteImprover(
+                distance_matrix=self.__model_data['distance_matrix'],
+                neighbors=self.__tour_polisher.neighbors,
+                max_route_distance=self.__max_route_distance(),
+                span_cost_coefficient=self.__span_cost_coefficient(),
+                depot=self.__model_data['depot'],
+                tour_polisher=self.__tour_polisher if self.polish_solutions else None
+            )
+
+    def __polish(self, objective, routes):
+        if self.__tour_polisher is None:
+            self.__build_route_improvement()
+
+        route_distances = self.__route_distances(routes=routes)
+        polished_routes, polish_seconds = self.__tour_polisher.polish(routes=routes)
+        polished_route_distances = self.__route_distances(routes=polished_routes)
+
+        return {
+            'objective': objective - (self.__route_cost(route_distances) - self.__route_cost(polished_route_distances)),
+            'routes': polished_routes,
+            'route_distances': polished_route_distances,
+            'polish': {
+                'distance_before': sum(route_distances),
+                'distance_after': sum(polished_route_distances),
+                'seconds': polish_seconds,
+                'two_opt_moves': self.__tour_polisher.two_opt_moves,
+                'or_opt_moves': self.__tour_polisher.or_opt_moves
+            }
+        }
+
+    def __improve(self, objective, routes):
+        if self.__route_improver is None:
+            self.__build_route_improvement()
+
+        route_distances = self.__route_distances(routes=routes)
+        improved_routes, improvement_seconds = self.__route_improver.improve(routes=routes)
+        improved_route_distances = self.__route_distances(routes=improved_routes)
+
+        return {
+            'objective': objective - (self.__route_cost(route_distances) - self.__route_cost(improved_route_distances)),
+            'routes': improved_routes,
+            'route_distances': improved_route_distances,
+            'improvement': {
+                'distance_before': sum(route_distances),
+                'distance_after': sum(improved_route_distances),
+                'longest_route_before': max(route_distances),
+                'longest_route_after': max(improved_route_distances),
+                'seconds': improvement_seconds,
+                'relocate_moves': self.__route_improver.relocate_moves,
+                'swap_moves': self.__route_improver.swap_moves,
+                'two_opt_star_moves': self.__route_improver.two_opt_star_moves,
+                'two_opt_moves': self.__route_improver.two_opt_moves,
+                'or_opt_moves': self.__route_improver.or_opt_moves
+            }
+        }
+
+    def __route_cost(self, route_distances):
+        # what the routing model charges for the routes: their distance plus the span cost of the longest one
+        return sum(route_distances) + self.__span_cost_coefficient() * max(route_distances)
+
+    def __max_route_distance(self):
+        return int(self.__model_data['max_route'] * self.upper_limit_coefficient)
+
+    def __span_cost_coefficient(self):
+        return int((self.__model_data['max_route'] * self.upper_limit_coefficient)/10)
+
+    def __report_result(self, strategy, result):
+        self.results[strategy] = result
+
+        if result['model_build_seconds'] is not None:
+            self.__logger.info(f"Routing model built in {format(result['model_build_seconds'])} seconds")
+
+        if self.initial_routes is not None and strategy in ['GUIDED_LOCAL_SEARCH', 'PORTFOLIO']:
+            if result['warm_started']:
+                self.__logger.info(f'{strategy} strategy warm started from the initial routes')
+            else:
+                self.__logger.info(f'Initial routes are not a feasible assignment, {strategy} strategy started from scratch')
+
+        self.__log_convergence_trace(convergence_trace=result['convergence_trace'])
+
+        if result['checkpoint'] is not None:
+            self.__logger.info(
+                f"Checkpoint of the best routes written {result['checkpoint']['writes']} times "
+                f"to {result['checkpoint']['file_path']}"
+            )
+
+        if result.get('checkpoint_incumbents') is not None:
+            self.__report_checkpoints(strategy=strategy, checkpoint_incumbents=result['checkpoint_incumbents'])
+            return
+
+        self.__log_polish(polish=result.get('polish'))
+        self.__log_improvement(improvement=result.get('improvement'))
+
+        with self.phase_profiler.phase('log_solution'):
+            self.__log_solution(
+                strategy=strategy,
+                routes=result['routes'],
+                route_distances=result['route_distances']
+            )
+
+        with self.phase_profiler.phase('export_routes'):
+            self.__export_routes(
+                strategy=strategy,
+                objective=result['objective'],
+                routes=result['routes'],
+                route_distances=result['route_distances']
+            )
+
+        with self.phase_profiler.phase('plot_solution'):
+            self.__plot_solution(strategy=strategy, routes=result['routes'])
+
+    def __resolve_initial_routes(self):
+        if self.initial_routes not in self.FIRST_SOLUTION_STRATEGIES:
+            return self.initial_routes
+
+        if self.initial_routes not in self.results:
+            # in parallel workers the first solution strategy has not run yet, it is solved here again
+            return self.solve_strategy(strategy=self.initial_routes)['routes']
+
+        return self.results[self.initial_routes]['routes']
+
+    def __log_phase_breakdown(self):
+        for line in self.phase_profiler.report():
+            print(line)
+            self.__logger.info(line)
+
+        profile_report = self.phase_profiler.profile_report(
+            file_path=r"{}\{}\files\{}\logs\{}".format(
+                self.__common_directory,
+                self.matrix_type.casefold(),
+                self.problem_name,
+                self.__file_name + "_profile.prof"
+            )
+        )
+
+        if profile_report is not None:
+            self.__logger.info(f'cProfile of the phases, by cumulative time:\n{profile_report}')
+
+    def __log_convergence_trace(self, convergence_trace):
+        if convergence_trace is None:
+            return
+
+        self.__logger.info(
+            f"Convergence trace of {convergence_trace['improvements']} improving solutions "
+            f"out of {convergence_trace['solutions']} written to {convergence_trace['file_path']}"
+        )
+
+    def __report_checkpoints(self, strategy, checkpoint_incumbents):
+        for checkpoint, incumbent in sorted(checkpoint_incumbents.items()):
+            log_handler = self.__checkpoint_log_handler(checkpoint=checkpoint)
+
+            try:
+                if incumbent is not None:
+                    self.__logger.info(f"Incumbent found after {format(incumbent['seconds'])} seconds of search")
+                    self.__log_polish(polish=incumbent.get('polish'))
+                    self.__log_improvement(improvement=incumbent.get('improvement'))
+
+                with self.phase_profiler.phase('log_solution'):
+                    self.__log_solution(
+                        strategy=strategy,
+                        routes=incumbent['routes'] if incumbent is not None else None,
+                        time_limit_seconds=checkpoint
+                    )
+
+                with self.phase_profiler.phase('export_routes'):
+                    self.__export_routes(
+                        strategy=strategy,
+                        objective=incumbent['objective'] if incumbent is not None else None,
+                        routes=incumbent['routes'] if incumbent is not None else None,
+                        time_limit_seconds=checkpoint
+                    )
+
+                with self.phase_profiler.phase('plot_solution'):
+                    self.__plot_solution(
+                        strategy=strategy,
+                        routes=incumbent['routes'] if incumbent is not None else None,
+                        time_limit_seconds=checkpoint
+                    )
+            finally:
+                if log_handler is not None:
+                    self.__logger.removeHandler(log_handler)
+                    log_handler.close()
+
+    def __log_polish(self, polish):
+        if polish is None:
+            return
+
+        shortening = polish['distance_before'] - polish['distance_after']
+
+        self.__logger.info(
+            f"Polished with {polish['two_opt_moves']} 2-opt and {polish['or_opt_moves']} Or-opt moves "
+            f"in {format(polish['seconds'])} seconds: distance from {polish['distance_before']} "
+            f"to {polish['distance_after']}, {format(100 * shortening / max(polish['distance_before'], 1))}% shorter"
+        )
+
+    def __log_improvement(self, improvement):
+        if improvement is None:
+            return
+
+        self.__logger.info(
+            f"Improved between routes with {improvement['relocate_moves']} relocate, {improvement['swap_moves']} "
+            f"swap and {improvement['two_opt_star_moves']} 2-opt* moves, and within them with "
+            f"{improvement['two_opt_moves']} 2-opt and {improvement['or_opt_moves']} Or-opt moves, "
+            f"in {format(improvement['seconds'])} seconds: distance from {improvement['distance_before']} to "
+            f"{improvement['distance_after']}, longest route from {improvement['longest_route_before']} to "
+            f"{improvement['longest_route_after']}"
+        )
+
+    def __checkpoint_log_handler(self, checkpoint):
+        if checkpoint == self.time_limit_seconds:
+            return None
+
+        log_handler = FileHandler(
+            filename=r"{}\{}\files\{}\logs\{}".format(
+                self.__common_directory,
+                self.matrix_type.casefold(),
+                self.problem_name,
+                (self.__file_name + "_" + str(checkpoint) + "_seconds.log")
+            ),
+            mode='a'
+        )
+        log_handler.setFormatter(Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        self.__logger.addHandler(log_handler)
+
+        return log_handler
+
+    def __log_solution(self, strategy, routes, route_distances=None, time_limit_seconds=None):
         print(f"Logging solution achieved by strategy: {strategy}")
 
-        if strategy in ['GUIDED_LOCAL_SEARCH']:
+        if time_limit_seconds is None:
+            time_limit_seconds = self.time_limit_seconds
+
+        if strategy in ['GUIDED_LOCAL_SEARCH', 'PORTFOLIO']:
             self.__logger.info(
-                f'Solution achieved by {strategy} strategy with time limit on {self.time_limit_seconds} seconds')
+                f'Solution achieved by {strategy} strategy with time limit on {time_limit_seconds} seconds')
         else:
             self.__logger.info(f'Solution achieved by {strategy} strategy')
 
-        if solution is not None:
+        if routes is not None:
+            if route_distances is None:
+                route_distances = self.__route_distances(routes=routes)
+
             if self.matrix_type.casefold() == 'real_world':
                 max_allowed_route_in_hours = (self.__model_data['max_route'] * self.upper_limit_coefficient) / 3600000000
                 max_possible_route_in_hours = self.__model_data['max_route'] / 3600000000
@@ -227,19 +994,10 @@ class OrToolsVRPSolver:
 
                 max_route_distance = 0
 
-                for vehicle_id in range(self.__model_data['num_vehicles']):
-                    index = self.__routing.Start(vehicle_id)
+                for vehicle_id, (route, route_distance) in enumerate(zip(routes, route_distances)):
                     plan_output = f'Route for vehicle {vehicle_id}:\n'
-                    route_distance = 0
-
-                    while not self.__routing.IsEnd(index):
-                        plan_output += f' {self.__manager.IndexToNode(index) + 1} ->'
-                        previous_index = index
-                        index = solution.Value(self.__routing.NextVar(index))
-                        route_distance += self.__routing.GetArcCostForVehicle(
-                            previous_index, index, vehicle_id)
-
-                    plan_output += f' {self.__manager.IndexToNode(index) + 1}\n'
+                    plan_output += ''.join(f' {node + 1} ->' for node in route[:-1])
+                    plan_output += f' {route[-1] + 1}\n'
                     if self.matrix_type.casefold() == 'real_world':
                         plan_output += f'Distance of the route: {format(route_distance / 3600000000)} ' \
                                        f'{self.dimension_name}\n '
@@ -264,152 +1022,154 @@ class OrToolsVRPSolver:
                     return
                 self.__logger.info(f'Maximum of the route distances: {max_route_distance} {self.dimension_name}\n')
 
-    def __plot_solution(self, strategy, solution):
+    def __export_routes(self, strategy, objective, routes, route_distances=None, time_limit_seconds=None):
+        if self.route_export is None or routes is None:
+            return
+
+        if time_limit_seconds is None:
+            time_limit_seconds = self.time_limit_seconds
+
+        if strategy in ['GUIDED_LOCAL_SEARCH', 'PORTFOLIO']:
+            export_name = self.__file_name + "_" + strategy + "_" + str(time_limit_seconds) + "_seconds_routes"
+        else:
+            export_name = self.__file_name + "_" + strategy + "_routes"
+
+        file_path = RouteExporter.write(
+            file_path=r"{}\{}\files\{}\logs\{}".format(
+                self.__common_directory,
+                self.matrix_type.casefold(),
+                self.problem_name,
+                export_name + RouteExporter.FORMATS[self.route_export]
+            ),
+            routes=routes,
+            route_distances=route_distances if route_distances is not None else self.__route_distances(routes=routes),
+            metadata={
+                'problem_name': self.problem_name,
+                'strategy': strategy,
+                'time_limit_seconds': time_limit_seconds if strategy in ['GUIDED_LOCAL_SEARCH', 'PORTFOLIO'] else None,
+                'objective': objective
+            },
+            export_format=self.route_export
+        )
+        self.__logger.info(f'Routes exported to {file_path}')
+
+    def __plot_solution(self, strategy, routes, time_limit_seconds=None):
         print(f"Plotting solution achieved by strategy: {strategy}")
 
-        if solution is not None:
-            for vehicle_id in range(self.__model_data['num_vehicles']):
-                index = self.__routing.Start(vehicle_id)
-                point = self.__manager.IndexToNode(index)
-                x, y = self.__model_data['points_matrix'][point]
-                pyplot.plot(x, y, 'ro', markersize=self.marker_size_on_image_solution)
-                while not self.__routing.IsEnd(index):
-                    index = solution.Value(self.__routing.NextVar(index))
-                    point = self.__manager.IndexToNode(index)
-                    x, y = self.__model_data['points_matrix'][point]
-                    pyplot.plot(x, y, 'ro', markersize=self.marker_size_on_image_solution)
-
-                index = self.__routing.Start(vehicle_id)
-                point = self.__manager.IndexToNode(index)
-                while not self.__routing.IsEnd(index):
-                    index = solution.Value(self.__routing.NextVar(index))
-                    previous_point = point
-                    point = self.__manager.IndexToNode(index)
-
-                    x1, y1 = self.__model_data['points_matrix'][previous_point]
-                    x2, y2 = self.__model_data['points_matrix'][point]
-                    pyplot.plot([x1, x2], [y1, y2], 'k-', linewidth=self.line_width_on_image_solution)
-
-            pyplot.axis("off")
-
-            if strategy == 'GUIDED_LOCAL_SEARCH':
-                pyplot.savefig(
-                    r"{}\{}\files\{}\solutions_images\{}".format(
-                        self.__common_directory,
-                        self.matrix_type.casefold(),
-                        self.problem_name,
-                        (self.__file_name + "_" + strategy + "_" + str(self.time_limit_seconds) + "_seconds.png")
-                    ),
-                    format='png',
-                    dpi=self.dpi_on_image_solution
-                )
-                pyplot.close()
+        if time_limit_seconds is None:
+            time_limit_seconds = self.time_limit_seconds
+
+        if routes is not None:
+            if strategy in ['GUIDED_LOCAL_SEARCH', 'PORTFOLIO']:
+                image_name = self.__file_name + "_" + strategy + "_" + str(time_limit_seconds) + "_seconds.png"
             else:
-                pyplot.savefig(
-                    r"{}\{}\files\{}\solutions_images\{}".format(
-                        self.__common_directory,
-                        self.matrix_type.casefold(),
-                        self.problem_name,
-                        (self.__file_name + "_" + strategy + ".png")
-                    ),
-                    format='png',
-                    dpi=self.dpi_on_image_solution
+                image_name = self.__file_name + "_" + strategy + ".png"
+
+            self.__render(
+                routes=routes,
+                file_path=r"{}\{}\files\{}\solutions_images\{}".format(
+                    self.__common_directory,
+                    self.matrix_type.casefold(),
+                    self.problem_name,
+                    image_name
                 )
-                pyplot.close()
+            )
+
+    def __render(self, routes, file_path):
+        if not self.background_rendering:
+            RoutePlotter(
+                points_matrix=self.__model_data['points_matrix'],
+                marker_size=self.marker_size_on_image_solution,
+                line_width=self.line_width_on_image_solution,
+                dpi=self.dpi_on_image_solution
+            ).plot(routes=routes, file_path=file_path)
+            return
+
+        if self.__render_queue is None:
+            self.__render_queue = RenderQueue(
+                points_matrix=self.__model_data['points_matrix'],
+                marker_size=self.marker_size_on_image_solution,
+                line_width=self.line_width_on_image_solution,
+                dpi=self.dpi_on_image_solution
+            )
+
+        self.__render_queue.submit(routes=routes, file_path=file_path)
+
+    def wait_for_renders(self):
+        if self.__render_queue is None:
+            return
+
+        with self.phase_profiler.phase('wait_for_renders'):
+            failures = self.__render_queue.close()
 
-    def log_and_plot_optimum_solution(self):
+        self.__render_queue = None
+
+        for file_path, error in failures:
+            print(f"Problem rendering {file_path}!")
+            self.__logger.info(f"Problem rendering {file_path}, resulting on the error: {str(error)}")
+
+    def routes_distance(self, routes):
+        return sum(self.__route_distances(routes=routes))
+
+    def log_and_plot_optimum_solution(self, file_path=None):
         try:
-            self.__log_optimum_solution()
-            self.__plot_optimum_solution()
+            routes = TourEvaluator.load(
+                file_path=file_path if file_path is not None else self.__optimum_tour_file_path()
+            )
+            self.__log_optimum_solution(routes=routes)
+            self.__plot_optimum_solution(routes=routes)
         except Exception as e:
             print("Problem opening optimum solution file!")
             self.__logger.info("Problem opening optimum solution file!")
             self.__logger.info(f"Resulting on the error: {str(e)}")
 
-    def __log_optimum_solution(self):
-        print(f"Logging optimum solution to the problem {self.problem_name}")
+        self.wait_for_renders()
 
-        opt_file_path = r"{}\tsplib\files\{}\TSP_{}_opt_tour.txt".format(
-            self.__common_directory,
-            self.problem_name,
-            self.problem_name
-        )
+    def evaluate_routes(self, routes):
+        return self.__tour_evaluator().evaluate(routes=routes)
 
-        opt_file = open(
-            file=opt_file_path,
-            mode='r'
+    def __tour_evaluator(self):
+        return TourEvaluator(
+            distance_matrix=self.__model_data['distance_matrix'],
+            max_route_distance=self.__max_route_distance(),
+            depot=self.__model_data['depot']
         )
 
-        plan_output = 'Route on opt file:\n'
-        route_distance = 0
-        index = 0
-        previous_index = 0
-
-        for line in opt_file:
-            index = int(line.strip()) - 1
-            plan_output += f'{index + 1} -> '
-            route_distance += self.__model_data['distance_matrix'][index][previous_index]
-            previous_index = index
-
-        plan_output += '1'
-        route_distance += self.__model_data['distance_matrix'][index][0]
-
-        self.__logger.info("Optimum Solution")
-        self.__logger.info(f'Objective: {route_distance} Unit of Measure')
-        self.__logger.info(plan_output)
-
-    def __plot_optimum_solution(self):
-        print(f"Plotting optimum solution to the problem {self.problem_name}")
-
-        opt_file_path = r"{}\tsplib\files\{}\TSP_{}_opt_tour.txt".format(
+    def __optimum_tour_file_path(self):
+        return r"{}\{}\files\{}\TSP_{}_opt_tour.txt".format(
             self.__common_directory,
+            self.matrix_type.casefold(),
             self.problem_name,
             self.problem_name
         )
 
-        opt_file = open(
-            file=opt_file_path,
-            mode='r'
-        )
-
-        index = 0
-        previous_index = 0
-
-        for line in opt_file:
-            index = int(line.strip()) - 1
-            x1, y1 = self.__model_data['points_matrix'][previous_index]
-            x2, y2 = self.__model_data['points_matrix'][index]
-            pyplot.plot(x1, y1, 'ro', markersize=self.marker_size_on_image_solution)
-            pyplot.plot(x2, y2, 'ro', markersize=self.marker_size_on_image_solution)
-            previous_index = index
-
-        index = 0
-        previous_index = 0
-        opt_file = open(file=opt_file_path, mode='r')
-        for line in opt_file:
-            index = int(line.strip()) - 1
+    def __log_optimum_solution(self, routes):
+        print(f"Logging optimum solution to the problem {self.problem_name}")
 
-            x1, y1 = self.__model_data['points_matrix'][previous_index]
-            x2, y2 = self.__model_data['points_matrix'][index]
+        evaluation = self.evaluate_routes(routes=routes)
 
-            if index != previous_index:
-                pyplot.plot([x1, x2], [y1, y2], 'k-', linewidth=self.line_width_on_image_solution)
+        self.__logger.info("Optimum Solution")
+        self.__logger.info(f"Objective: {evaluation['total_distance']} Unit of Measure")
 
-            previous_index = index
+        for route in routes:
+            self.__logger.info('Route on opt file:\n' + ' -> '.join(str(node + 1) for node in route))
 
-        x1, y1 = self.__model_data['points_matrix'][index]
-        x2, y2 = self.__model_data['points_matrix'][0]
+        if not evaluation['feasible']:
+            self.__logger.info(
+                f"Routes are not a feasible solution: closed at the depot {evaluation['closed']}, "
+                f"{len(evaluation['missing_nodes'])} nodes missing, {len(evaluation['repeated_nodes'])} repeated, "
+                f"routes over the max allowed route {evaluation['over_limit_routes']}"
+            )
 
-        pyplot.plot([x1, x2], [y1, y2], 'k-', linewidth=self.line_width_on_image_solution)
+    def __plot_optimum_solution(self, routes):
+        print(f"Plotting optimum solution to the problem {self.problem_name}")
 
-        pyplot.axis("off")
-        pyplot.savefig(
-            r"{}\tsplib\files\{}\solutions_images\{}".format(
+        self.__render(
+            routes=routes,
+            file_path=r"{}\{}\files\{}\solutions_images\{}".format(
                 self.__common_directory,
+                self.matrix_type.casefold(),
                 self.problem_name,
                 (self.__file_name + "_OPTIMUM_ROUTE.png")
-            ),
-            format='png',
-            dpi=self.dpi_on_image_solution
+            )
         )
-        pyplot.close()
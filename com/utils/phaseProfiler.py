@@ -0,0 +1,118 @@
+from contextlib import contextmanager
+from cProfile import Profile
+from io import StringIO
+from pstats import Stats
+from time import perf_counter
+
+
+class PhaseProfiler:
+    """
+    Times the phases of a solver run and reports how the wall clock time was split between them.
+
+    Phases nest: a phase opened inside another one is reported under it, so the time of a
+    strategy is broken down into building the model, solving, logging and plotting. With the
+    cprofile mode a cProfile profiler also runs inside the outermost phases, which shows what
+    a phase spends its time on, the transit callbacks called back from the solve included.
+    Phases timed by worker processes are merged in under a label of their own, their seconds
+    overlap the wall clock time of the phase that waited for them.
+    """
+    MODES = [None, 'cprofile']
+
+    mode: str = None
+    phases: dict = None
+    __stack: list = None
+    __start_time = None
+    __profile = None
+
+    def __init__(self, mode=None):
+        if mode not in self.MODES:
+            raise ValueError(f'Unknown profiler mode {mode}, expected one of {self.MODES}')
+
+        self.mode = mode
+        self.phases = {}
+        self.__stack = []
+        self.__start_time = perf_counter()
+
+        if self.mode == 'cprofile':
+            self.__profile = Profile()
+
+    def __getstate__(self):
+        # the cProfile profiler cannot be pickled, workers time their phases without it
+        state = self.__dict__.copy()
+        state['_PhaseProfiler__profile'] = None
+        return state
+
+    @contextmanager
+    def phase(self, name):
+        self.__stack.append(name)
+        # registered on entry, so phases are reported in the order they started
+        phase = self.phases.setdefault('/'.join(self.__stack), {'seconds': 0.0, 'calls': 0})
+        outermost = len(self.__stack) == 1
+
+        if outermost and self.__profile is not None:
+            self.__profile.enable()
+
+        start_time = perf_counter()
+
+        try:
+            yield
+        finally:
+            phase['seconds'] += perf_counter() - start_time
+            phase['calls'] += 1
+
+            if outermost and self.__profile is not None:
+                self.__profile.disable()
+
+            self.__stack.pop()
+
+    def merge(self, phases, label):
+        """Adds the phases a worker process timed under label, nested in the phase open here."""
+        prefix = '/'.join(self.__stack + [label])
+        worker_phase = self.phases.setdefault(prefix, {'seconds': 0.0, 'calls': 0})
+        worker_phase['calls'] += 1
+
+        for path, phase in phases.items():
+            if '/' not in path:
+                worker_phase['seconds'] += phase['seconds']
+
+            merged_phase = self.phases.setdefault(f'{prefix}/{path}', {'seconds': 0.0, 'calls': 0})
+            merged_phase['seconds'] += phase['seconds']
+            merged_phase['calls'] += phase['calls']
+
+    def breakdown(self):
+        total_seconds = perf_counter() - self.__start_time
+
+        return {
+            'total_seconds': total_seconds,
+            'phases': {
+                path: {**phase, 'share': phase['seconds'] / total_seconds if total_seconds > 0 else None}
+                for path, phase in self.phases.items()
+            }
+        }
+
+    def report(self):
+        breakdown = self.breakdown()
+        lines = [f"Phase breakdown of {breakdown['total_seconds']:.3f} seconds:"]
+
+        for path, phase in breakdown['phases'].items():
+            lines.append(
+                f"{'    ' * (path.count('/') + 1)}{path.split('/')[-1]}: {phase['seconds']:.3f} seconds "
+                f"({phase['share']:.1%}, {phase['calls']} calls)"
+            )
+
+        outside_seconds = breakdown['total_seconds'] - sum(
+            phase['seconds'] for path, phase in breakdown['phases'].items() if '/' not in path
+        )
+        lines.append(f'    outside any phase: {outside_seconds:.3f} seconds')
+
+        return lines
+
+    def profile_report(self, file_path, top=20):
+        if self.__profile is None:
+            return None
+
+        self.__profile.dump_stats(file_path)
+        stream = StringIO()
+        Stats(self.__profile, stream=stream).sort_stats('cumulative').print_stats(top)
+
+        return stream.getvalue()
@@ -0,0 +1,54 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from numpy import asarray, float64
+
+from com.utils.routePlotter import RoutePlotter
+
+# the plotter of the rendering process, built once by its initializer
+route_plotter: RoutePlotter = None
+
+
+def start_renderer(points, marker_size, line_width, dpi):
+    global route_plotter
+    route_plotter = RoutePlotter(points_matrix=points, marker_size=marker_size, line_width=line_width, dpi=dpi)
+
+
+def render(routes, file_path):
+    route_plotter.plot(routes=routes, file_path=file_path)
+    return file_path
+
+
+class RenderQueue:
+    """
+    Renders route images in a separate process while the solver moves on to the next strategy.
+
+    The coordinates are sent once, when the rendering process starts, and each image then only
+    sends its routes and file path. Renders run in the order they were submitted, and close()
+    waits for the outstanding ones, returning the images that failed instead of raising, so a
+    broken image never costs the solution already logged.
+    """
+    __executor: ProcessPoolExecutor = None
+    __pending: list = None
+
+    def __init__(self, points_matrix, marker_size, line_width, dpi):
+        self.__executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=get_context('spawn'),
+            initializer=start_renderer,
+            initargs=(asarray(points_matrix, dtype=float64), marker_size, line_width, dpi)
+        )
+        self.__pending = []
+
+    def submit(self, routes, file_path):
+        self.__pending.append((file_path, self.__executor.submit(render, routes, file_path)))
+
+    def close(self):
+        failures = [
+            (file_path, future.exception()) for file_path, future in self.__pending
+            if future.exception() is not None
+        ]
+        self.__pending = []
+        self.__executor.shutdown(wait=True)
+
+        return failures
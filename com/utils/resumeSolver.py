@@ -0,0 +1,41 @@
+from math import ceil
+from sys import argv
+
+from com.utils.orToolsTSPSolver import OrToolsTSPSolver
+from com.utils.orToolsVRPSolver import OrToolsVRPSolver
+from com.utils.searchCheckpoint import SearchCheckpoint
+
+SOLVERS = {solver.__name__: solver for solver in [OrToolsTSPSolver, OrToolsVRPSolver]}
+
+
+def resume_from_checkpoint(checkpoint_path):
+    checkpoint = SearchCheckpoint.load(file_path=checkpoint_path)
+    remaining_seconds = ceil(checkpoint['time_limit_seconds'] - checkpoint['search_seconds'])
+
+    if remaining_seconds <= 0:
+        print(f"Checkpoint {checkpoint_path} already spent its {checkpoint['time_limit_seconds']} seconds budget")
+        return None
+
+    print(
+        f"Resuming {checkpoint['strategy']} on {checkpoint['solver_parameters']['problem_name']} from objective "
+        f"{checkpoint['objective']} after {format(checkpoint['search_seconds'])} seconds, "
+        f"{remaining_seconds} seconds left"
+    )
+
+    solver = SOLVERS[checkpoint['solver']](
+        **checkpoint['solver_parameters'],
+        strategies=[checkpoint['strategy']],
+        time_limit_on_seconds_to_metaheuristics=remaining_seconds,
+        initial_routes=checkpoint['routes'],
+        resumed_search_seconds=checkpoint['search_seconds']
+    )
+    solver.execute_strategies()
+
+    return solver
+
+
+if __name__ == '__main__':
+    if len(argv) != 2:
+        raise SystemExit('Usage: resumeSolver.py <checkpoint json file>')
+
+    resume_from_checkpoint(checkpoint_path=argv[1])
@@ -0,0 +1,105 @@
+from csv import DictReader, DictWriter
+from json import dumps, loads
+
+from numpy import array, asarray, concatenate, cumsum, int32, int64, load as load_arrays, savez_compressed
+
+
+class RouteExporter:
+    """
+    Writes the routes of a solution to a structured file, one record per vehicle.
+
+    Nodes are 0-based with the depot at both ends, as the solvers hold them. Each record also
+    carries the distance of the route and its load, the number of stops it serves, since the
+    models have no demands. jsonl and csv records are written one vehicle at a time; the binary
+    form keeps every route in a single compressed array with the offsets where each one starts.
+    Any of them is read back by read(), and by RouteLoader for warm starts.
+    """
+    FORMATS = {'jsonl': '.jsonl', 'csv': '.csv', 'binary': '.npz'}
+    CSV_FIELDS = ['problem_name', 'strategy', 'time_limit_seconds', 'objective', 'vehicle', 'distance', 'load', 'nodes']
+
+    @classmethod
+    def write(cls, file_path, routes, route_distances, metadata, export_format='jsonl'):
+        if export_format not in cls.FORMATS:
+            raise ValueError(f'Unknown route export format {export_format}, expected one of {list(cls.FORMATS)}')
+
+        routes = [asarray(route, dtype=int32) for route in routes]
+        route_loads = [max(len(route) - 2, 0) for route in routes]
+
+        if export_format == 'binary':
+            savez_compressed(
+                file_path,
+                nodes=concatenate(routes),
+                offsets=cumsum([0] + [len(route) for route in routes], dtype=int64),
+                distances=asarray(route_distances, dtype=int64),
+                loads=asarray(route_loads, dtype=int64),
+                metadata=array(dumps(metadata))
+            )
+            return file_path
+
+        with open(file=file_path, mode='w', newline='') as export_file:
+            csv_writer = None
+
+            if export_format == 'csv':
+                csv_writer = DictWriter(export_file, fieldnames=cls.CSV_FIELDS, extrasaction='ignore')
+                csv_writer.writeheader()
+
+            for vehicle, (route, route_distance, route_load) in enumerate(zip(routes, route_distances, route_loads)):
+                record = {**metadata, 'vehicle': vehicle, 'distance': int(route_distance), 'load': route_load}
+
+                if csv_writer is not None:
+                    csv_writer.writerow({**record, 'nodes': ' '.join(map(str, route.tolist()))})
+                else:
+                    export_file.write(dumps({**record, 'nodes': route.tolist()}) + '\n')
+
+        return file_path
+
+    @classmethod
+    def read(cls, file_path):
+        if file_path.endswith(cls.FORMATS['binary']):
+            with load_arrays(file_path) as arrays:
+                offsets = arrays['offsets']
+
+                return {
+                    'metadata': loads(str(arrays['metadata'])),
+                    'routes': [arrays['nodes'][start:end] for start, end in zip(offsets[:-1], offsets[1:])],
+                    'distances': arrays['distances'].tolist(),
+                    'loads': arrays['loads'].tolist()
+                }
+
+        with open(file=file_path, mode='r', newline='') as export_file:
+            if file_path.endswith(cls.FORMATS['csv']):
+                records = [
+                    {
+                        **{field: cls.csv_value(value) for field, value in record.items()},
+                        'nodes': [int(node) for node in record['nodes'].split()]
+                    }
+                    for record in DictReader(export_file)
+                ]
+            else:
+                records = [loads(line) for line in export_file if line.strip()]
+
+        records.sort(key=lambda record: int(record['vehicle']))
+
+        return {
+            'metadata': {
+                field: value for field, value in records[0].items()
+                if field not in ['vehicle', 'distance', 'load', 'nodes']
+            } if records else {},
+            'routes': [asarray(record['nodes'], dtype=int32) for record in records],
+            'distances': [int(record['distance']) for record in records],
+            'loads': [int(record['load']) for record in records]
+        }
+
+    @staticmethod
+    def csv_value(value):
+        # csv keeps no types, numbers and the empty fields of missing values are restored here
+        if value == '':
+            return None
+
+        for parse in [int, float]:
+            try:
+                return parse(value)
+            except ValueError:
+                pass
+
+        return value
@@ -0,0 +1,255 @@
+from collections import deque
+from time import perf_counter
+
+from numpy import asarray, int32
+
+
+class RouteImprover:
+    """
+    Relocate, swap and 2-opt* moves between the routes of a distance constrained VRP.
+
+    Moves are looked for around the k nearest neighbors of every customer lying on another route,
+    and scored on the objective of the routing model: the total distance plus the span cost
+    coefficient times the longest route, so a move that balances the routes is taken even when it
+    adds some distance. Every route keeps the cumulative distance up to each of its nodes, so the
+    length of a route after any move, 2-opt* tails exchanges included, is known in constant time
+    and checked against max_route_distance before the move is applied. When a tour polisher is
+    given, its intra-route 2-opt and Or-opt search is interleaved with the inter-route one until
+    neither improves the routes.
+    """
+    distance_matrix = None
+    neighbors: list = None
+    max_route_distance: int = None
+    span_cost_coefficient: int = None
+    depot: int = None
+    tour_polisher = None
+    relocate_moves: int = None
+    swap_moves: int = None
+    two_opt_star_moves: int = None
+    two_opt_moves: int = None
+    or_opt_moves: int = None
+    __distance = None
+    __routes: list = None
+    __prefix_distances: list = None
+    __route_of: list = None
+    __index_of: list = None
+    __longest_routes: list = None
+
+    def __init__(
+            self,
+            distance_matrix,
+            neighbors,
+            max_route_distance=None,
+            span_cost_coefficient=0,
+            depot=0,
+            tour_polisher=None
+    ):
+        self.distance_matrix = distance_matrix
+        self.neighbors = neighbors.tolist() if hasattr(neighbors, 'tolist') else neighbors
+        self.max_route_distance = max_route_distance
+        self.span_cost_coefficient = span_cost_coefficient
+        self.depot = depot
+        self.tour_polisher = tour_polisher
+        self.__distance = distance_matrix.distance
+
+    def improve(self, routes):
+        start_time = perf_counter()
+        self.relocate_moves = 0
+        self.swap_moves = 0
+        self.two_opt_star_moves = 0
+        self.two_opt_moves = 0
+        self.or_opt_moves = 0
+        routes = [[int(node) for node in route] for route in routes]
+
+        while True:
+            routes = self.__search(routes=routes)
+
+            if self.tour_polisher is None:
+                break
+
+            polished_routes, _ = self.tour_polisher.polish(routes=routes)
+            routes = [route.tolist() for route in polished_routes]
+            self.two_opt_moves += self.tour_polisher.two_opt_moves
+            self.or_opt_moves += self.tour_polisher.or_opt_moves
+
+            if self.tour_polisher.two_opt_moves + self.tour_polisher.or_opt_moves == 0:
+                # the routes were left as the inter-route search converged
+                break
+
+        return [asarray(route, dtype=int32) for route in routes], perf_counter() - start_time
+
+    def __search(self, routes):
+        self.__routes = routes
+        self.__prefix_distances = [None] * len(routes)
+        self.__route_of = [-1] * len(self.distance_matrix)
+        self.__index_of = [-1] * len(self.distance_matrix)
+
+        for route_id in range(len(routes)):
+            self.__refresh_route(route_id=route_id)
+
+        self.__refresh_longest_routes()
+
+        customers = [node for route in routes for node in route if node != self.depot]
+        active = deque(customers)
+        queued = set(customers)
+
+        while active:
+            node = active.popleft()
+            queued.discard(node)
+            touched_nodes = self.__improve_node(node=node)
+
+            if touched_nodes is None:
+                continue
+
+            for touched_node in touched_nodes:
+                if touched_node != self.depot and touched_node not in queued:
+                    active.append(touched_node)
+                    queued.add(touched_node)
+
+        return self.__routes
+
+    def __refresh_route(self, route_id):
+        route = self.__routes[route_id]
+        prefix_distances = [0] * len(route)
+
+        for index in range(1, len(route)):
+            prefix_distances[index] = prefix_distances[index - 1] + self.__distance(route[index - 1], route[index])
+
+        self.__prefix_distances[route_id] = prefix_distances
+
+        for index in range(1, len(route) - 1):
+            self.__route_of[route[index]] = route_id
+            self.__index_of[route[index]] = index
+
+    def __refresh_longest_routes(self):
+        # the three longest routes answer the longest one outside of any pair of routes
+        self.__longest_routes = sorted(
+            range(len(self.__routes)),
+            key=lambda route_id: self.__prefix_distances[route_id][-1],
+            reverse=True
+        )[:3]
+
+    def __route_length(self, route_id):
+        return self.__prefix_distances[route_id][-1]
+
+    def __improves(self, route_a, length_a, route_b, length_b):
+        if self.max_route_distance is not None and (
+                length_a > self.max_route_distance or length_b > self.max_route_distance
+        ):
+            return False
+
+        current_longest = self.__route_length(self.__longest_routes[0])
+        longest_other = max(
+            [self.__route_length(route_id) for route_id in self.__longest_routes if route_id not in (route_a, route_b)],
+            default=0
+        )
+        distance_delta = length_a + length_b - self.__route_length(route_a) - self.__route_length(route_b)
+        span_delta = max(longest_other, length_a, length_b) - current_longest
+
+        return distance_delta + self.span_cost_coefficient * span_delta < 0
+
+    def __improve_node(self, node):
+        route_a = self.__route_of[node]
+
+        for candidate in self.neighbors[node]:
+            if candidate == self.depot:
+                # the depot is on every route, next to the first and the last customer of each
+                occurrences = [
+                    (route_id, index) for route_id in range(len(self.__routes)) if route_id != route_a
+                    for index in [0, len(self.__routes[route_id]) - 1]
+                ]
+            elif self.__route_of[candidate] != route_a:
+                occurrences = [(self.__route_of[candidate], self.__index_of[candidate])]
+            else:
+                continue
+
+            for route_b, index_b in occurrences:
+                touched_nodes = self.__relocate(node, route_a, route_b, index_b) \
+                    or self.__swap(node, route_a, route_b, index_b) \
+                    or self.__two_opt_star(node, route_a, route_b, index_b)
+
+                if touched_nodes:
+                    return touched_nodes
+
+        return None
+
+    def __relocate(self, node, route_a, route_b, index_b):
+        distance = self.__distance
+        a, b = self.__routes[route_a], self.__routes[route_b]
+        index_a = self.__index_of[node]
+        previous_a, next_a = a[index_a - 1], a[index_a + 1]
+        length_a = self.__route_length(route_a) + distance(previous_a, next_a) \
+            - distance(previous_a, node) - distance(node, next_a)
+
+        # node goes right after or right before the candidate
+        for insert_after in [index_b, index_b - 1]:
+            if insert_after < 0 or insert_after > len(b) - 2:
+                continue
+
+            before, after = b[insert_after], b[insert_after + 1]
+            length_b = self.__route_length(route_b) + distance(before, node) + distance(node, after) \
+                - distance(before, after)
+
+            if self.__improves(route_a, length_a, route_b, length_b):
+                del a[index_a]
+                b.insert(insert_after + 1, node)
+                self.__apply(route_a, route_b)
+                self.relocate_moves += 1
+                return [node, previous_a, next_a, before, after]
+
+        return None
+
+    def __swap(self, node, route_a, route_b, index_b):
+        distance = self.__distance
+        a, b = self.__routes[route_a], self.__routes[route_b]
+        index_a = self.__index_of[node]
+        previous_a, next_a = a[index_a - 1], a[index_a + 1]
+
+        # node takes the place of a tour neighbor of the candidate, which takes the place of node
+        for swap_index in [index_b + 1, index_b - 1]:
+            if swap_index < 1 or swap_index > len(b) - 2:
+                continue
+
+            other = b[swap_index]
+            previous_b, next_b = b[swap_index - 1], b[swap_index + 1]
+            length_a = self.__route_length(route_a) + distance(previous_a, other) + distance(other, next_a) \
+                - distance(previous_a, node) - distance(node, next_a)
+            length_b = self.__route_length(route_b) + distance(previous_b, node) + distance(node, next_b) \
+                - distance(previous_b, other) - distance(other, next_b)
+
+            if self.__improves(route_a, length_a, route_b, length_b):
+                a[index_a], b[swap_index] = other, node
+                self.__apply(route_a, route_b)
+                self.swap_moves += 1
+                return [node, other, previous_a, next_a, previous_b, next_b]
+
+        return None
+
+    def __two_opt_star(self, node, route_a, route_b, index_b):
+        distance = self.__distance
+        a, b = self.__routes[route_a], self.__routes[route_b]
+        prefix_a, prefix_b = self.__prefix_distances[route_a], self.__prefix_distances[route_b]
+        total_a, total_b = self.__route_length(route_a), self.__route_length(route_b)
+        index_a = self.__index_of[node]
+
+        # the tails are exchanged after (cut_a, cut_b), linking a[cut_a] to b[cut_b + 1] and b[cut_b] to a[cut_a + 1]
+        for cut_a, cut_b in [(index_a, index_b - 1), (index_a - 1, index_b)]:
+            if cut_b < 0 or cut_b > len(b) - 2:
+                continue
+
+            length_a = prefix_a[cut_a] + distance(a[cut_a], b[cut_b + 1]) + total_b - prefix_b[cut_b + 1]
+            length_b = prefix_b[cut_b] + distance(b[cut_b], a[cut_a + 1]) + total_a - prefix_a[cut_a + 1]
+
+            if self.__improves(route_a, length_a, route_b, length_b):
+                touched_nodes = [a[cut_a], a[cut_a + 1], b[cut_b], b[cut_b + 1]]
+                a[cut_a + 1:], b[cut_b + 1:] = b[cut_b + 1:], a[cut_a + 1:]
+                self.__apply(route_a, route_b)
+                self.two_opt_star_moves += 1
+                return touched_nodes
+
+        return None
+
+    def __apply(self, route_a, route_b):
+        self.__refresh_route(route_id=route_a)
+        self.__refresh_route(route_id=route_b)
+        self.__refresh_longest_routes()
@@ -0,0 +1,58 @@
+from re import compile as compile_pattern
+
+from com.utils.routeExporter import RouteExporter
+
+
+class RouteLoader:
+    """
+    Reads the routes of a previous solution as lists of 0-based nodes, depot included at both ends.
+
+    Besides the route exports of RouteExporter, two formats are understood: the logs and
+    solution files written by the solvers, where each "Route for vehicle N:" header is followed
+    by the route as "1 -> 5 -> ... -> 1", and the optimum tour files, holding one 1-based node
+    per line. A log usually holds the solutions of several strategies, the last one written is
+    taken, which is the one of the metaheuristic.
+    """
+    ROUTE_HEADER = compile_pattern(r'Route for vehicle (\d+):')
+
+    @classmethod
+    def load(cls, file_path):
+        if file_path.endswith(tuple(RouteExporter.FORMATS.values())):
+            return RouteExporter.read(file_path=file_path)['routes']
+
+        with open(file=file_path, mode='r') as route_file:
+            lines = route_file.read().splitlines()
+
+        if any(cls.ROUTE_HEADER.search(line) for line in lines):
+            return cls.routes_from_log(lines=lines)
+
+        return cls.routes_from_tour(lines=lines)
+
+    @classmethod
+    def routes_from_log(cls, lines):
+        route_sets = []
+        previous_vehicle = None
+
+        for position, line in enumerate(lines[:-1]):
+            header = cls.ROUTE_HEADER.search(line)
+
+            if header is None:
+                continue
+
+            vehicle = int(header.group(1))
+
+            if previous_vehicle is None or vehicle <= previous_vehicle:
+                route_sets.append([])
+
+            route_sets[-1].append([int(node) - 1 for node in lines[position + 1].split('->') if node.strip()])
+            previous_vehicle = vehicle
+
+        return route_sets[-1]
+
+    @staticmethod
+    def routes_from_tour(lines):
+        tour = [int(line) - 1 for line in (line.strip() for line in lines) if line and int(line) > 0]
+        depot_position = tour.index(0)
+        tour = tour[depot_position:] + tour[:depot_position]
+
+        return [tour + tour[:1]]
@@ -0,0 +1,96 @@
+from os import getcwd, remove
+from os.path import dirname, exists, getsize
+from tempfile import gettempdir
+from time import perf_counter
+
+from matplotlib import pyplot
+
+from com.utils.matrix import Matrix
+from com.utils.routeLoader import RouteLoader
+from com.utils.routePlotter import RoutePlotter
+
+
+def plot_with_line2d(points_matrix, routes, marker_size, line_width, dpi, file_path):
+    # the per node and per edge plotting __plot_solution did before RoutePlotter
+    for route in routes:
+        for node in route:
+            x, y = points_matrix[node]
+            pyplot.plot(x, y, 'ro', markersize=marker_size)
+
+        for previous_node, node in zip(route, route[1:]):
+            x1, y1 = points_matrix[previous_node]
+            x2, y2 = points_matrix[node]
+            pyplot.plot([x1, x2], [y1, y2], 'k-', linewidth=line_width)
+
+    pyplot.axis("off")
+    pyplot.savefig(file_path, format='png', dpi=dpi)
+    pyplot.close()
+
+
+def timed_render(render, file_path):
+    start_time = perf_counter()
+    render(file_path)
+    seconds = perf_counter() - start_time
+    size = getsize(file_path)
+    remove(file_path)
+
+    return seconds, size
+
+
+if __name__ == '__main__':
+    instances = [
+        ('tsplib', 'a280', 280, 'int', 'EUCLIDEAN', 7, 2),
+        ('tsplib', 'pr2392', 2392, 'scientific_notation', 'EUCLIDEAN', 0.5, 0.3),
+    ]
+
+    for matrix_type, problem_name, size, coordinates_type, calc_dist_type, marker_size, line_width in instances:
+        local_file_path = r"{}\{}\files\{}\{}.txt".format(dirname(getcwd()), matrix_type, problem_name, problem_name)
+        opt_file_path = r"{}\{}\files\{}\TSP_{}_opt_tour.txt".format(
+            dirname(getcwd()),
+            matrix_type,
+            problem_name,
+            problem_name
+        )
+
+        if not exists(local_file_path) or not exists(opt_file_path):
+            print(f'Skipping {problem_name}, instance or optimum tour not found')
+            continue
+
+        matrix = Matrix(
+            rows_size=size,
+            columns_size=size,
+            matrix_type=matrix_type,
+            coordinates_type=coordinates_type,
+            calc_dist_type=calc_dist_type
+        )
+        matrix.build_matrix(file_path=local_file_path, use_cache=True)
+        routes = RouteLoader.load(file_path=opt_file_path)
+
+        print(f'{problem_name} ({size} nodes, optimum tour)')
+
+        for dpi in [300, 1200]:
+            line2d_seconds, line2d_size = timed_render(
+                render=lambda file_path: plot_with_line2d(
+                    points_matrix=matrix.points_matrix,
+                    routes=routes,
+                    marker_size=marker_size,
+                    line_width=line_width,
+                    dpi=dpi,
+                    file_path=file_path
+                ),
+                file_path=f'{gettempdir()}/{problem_name}_line2d.png'
+            )
+            route_plotter = RoutePlotter(
+                points_matrix=matrix.points_matrix,
+                marker_size=marker_size,
+                line_width=line_width,
+                dpi=dpi
+            )
+            collection_seconds, collection_size = timed_render(
+                render=lambda file_path: route_plotter.plot(routes=routes, file_path=file_path),
+                file_path=f'{gettempdir()}/{problem_name}_collections.png'
+            )
+
+            print(f'    dpi {dpi:5}: per artist {line2d_seconds:8.3f} s {line2d_size / 1000:10.1f} KB, '
+                  f'collections {collection_seconds:8.3f} s {collection_size / 1000:10.1f} KB, '
+                  f'{line2d_seconds / collection_seconds:6.1f}x faster')
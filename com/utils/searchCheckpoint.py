@@ -0,0 +1,112 @@
+from datetime import datetime
+from json import dump, load
+from math import inf
+from os import fsync, replace
+from time import perf_counter
+
+from com.utils.incumbentRecorder import IncumbentRecorder
+
+
+class SearchCheckpoint:
+    """
+    Solution callback keeping a crash-safe checkpoint of the best routes of a long search.
+
+    Every improvement is read from the model, and the file is rewritten at the first solution
+    callback once interval_seconds have elapsed since the last write, whether the routes improved
+    or not, so search_seconds and solutions stay current, and a last time when the search ends.
+    The checkpoint goes to a temporary file that is synced and then renamed over the previous
+    one, so a crash at any moment leaves either the old or the new checkpoint on disk, never a
+    truncated one. search_seconds accumulates the seconds spent by the runs this one resumed,
+    which is what the resume command subtracts from the budget. As in IncumbentRecorder,
+    objective_function gives the objective written for the routes when the model cost is not it.
+    """
+    routing = None
+    manager = None
+    num_vehicles: int = None
+    file_path: str = None
+    interval_seconds: float = None
+    metadata: dict = None
+    resumed_search_seconds: float = None
+    solutions: int = None
+    writes: int = None
+    objective_function = None
+    __incumbent = None
+    __incumbent_cost = None
+    __start_time = None
+    __last_write_time = None
+
+    def __init__(
+            self,
+            routing,
+            manager,
+            num_vehicles,
+            file_path,
+            interval_seconds,
+            metadata,
+            resumed_search_seconds=0,
+            objective_function=None
+    ):
+        self.routing = routing
+        self.manager = manager
+        self.num_vehicles = num_vehicles
+        self.file_path = file_path
+        self.interval_seconds = interval_seconds
+        self.metadata = metadata
+        self.resumed_search_seconds = resumed_search_seconds
+        self.objective_function = objective_function
+        self.solutions = 0
+        self.writes = 0
+
+    def start(self):
+        self.__start_time = perf_counter()
+        self.__last_write_time = -inf
+
+    def __call__(self):
+        self.solutions += 1
+        cost = self.routing.CostVar().Value()
+
+        if self.__incumbent_cost is None or cost < self.__incumbent_cost:
+            routes = IncumbentRecorder.current_routes(
+                routing=self.routing,
+                manager=self.manager,
+                num_vehicles=self.num_vehicles
+            )
+            self.__incumbent_cost = cost
+            self.__incumbent = {
+                'objective': self.objective_function(routes) if self.objective_function is not None else cost,
+                'routes': routes
+            }
+
+        if perf_counter() - self.__last_write_time >= self.interval_seconds:
+            self.write()
+
+    def finish(self):
+        if self.__incumbent is not None:
+            self.write()
+
+        return self.file_path
+
+    def write(self):
+        checkpoint = {
+            **self.metadata,
+            'objective': self.__incumbent['objective'],
+            'routes': self.__incumbent['routes'],
+            'search_seconds': self.resumed_search_seconds + perf_counter() - self.__start_time,
+            'solutions': self.solutions,
+            'written_at': datetime.now().isoformat()
+        }
+
+        with open(file=self.file_path + '.tmp', mode='w') as checkpoint_file:
+            dump(checkpoint, checkpoint_file)
+            checkpoint_file.flush()
+            fsync(checkpoint_file.fileno())
+
+        replace(self.file_path + '.tmp', self.file_path)
+
+        self.__last_write_time = perf_counter()
+        self.writes += 1
+
+    @staticmethod
+    def load(file_path):
+        with open(file=file_path, mode='r') as checkpoint_file:
+            return load(checkpoint_file)
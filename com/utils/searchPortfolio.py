@@ -0,0 +1,61 @@
+from ortools.constraint_solver import routing_enums_pb2
+from ortools.util import optional_boolean_pb2
+
+
+class SearchPortfolio:
+    """
+    Configurations of a multi-start portfolio, one per worker.
+
+    The configurations cycle through the metaheuristics first and then through the first
+    solution strategies, so a small portfolio already mixes different searches. Once every
+    pair was used, the following rounds repeat them with another random seed, turn on the
+    random path LNS operator so the seed actually changes the search, and move the GLS lambda
+    coefficient away from its 0.1 default.
+    """
+    METAHEURISTICS = ['GUIDED_LOCAL_SEARCH', 'TABU_SEARCH', 'SIMULATED_ANNEALING']
+    FIRST_SOLUTION_STRATEGIES = ['PATH_CHEAPEST_ARC', 'GLOBAL_CHEAPEST_ARC', 'SAVINGS', 'PARALLEL_CHEAPEST_INSERTION']
+    GUIDED_LOCAL_SEARCH_LAMBDA_COEFFICIENTS = [0.1, 0.2, 0.05, 0.3]
+
+    @classmethod
+    def configurations(cls, size, seed=0):
+        pairs = [
+            (metaheuristic, first_solution_strategy)
+            for first_solution_strategy in cls.FIRST_SOLUTION_STRATEGIES
+            for metaheuristic in cls.METAHEURISTICS
+        ]
+        configurations = []
+
+        for position in range(size):
+            metaheuristic, first_solution_strategy = pairs[position % len(pairs)]
+            round_number = position // len(pairs)
+
+            configurations.append({
+                'name': f'{metaheuristic}+{first_solution_strategy}#{round_number}',
+                'metaheuristic': metaheuristic,
+                'first_solution_strategy': first_solution_strategy,
+                'random_seed': seed + position,
+                'randomized': round_number > 0,
+                'guided_local_search_lambda_coefficient': cls.GUIDED_LOCAL_SEARCH_LAMBDA_COEFFICIENTS[
+                    round_number % len(cls.GUIDED_LOCAL_SEARCH_LAMBDA_COEFFICIENTS)
+                ]
+            })
+
+        return configurations
+
+    @staticmethod
+    def apply(search_parameters, configuration):
+        search_parameters.local_search_metaheuristic = getattr(
+            routing_enums_pb2.LocalSearchMetaheuristic, configuration['metaheuristic']
+        )
+        search_parameters.first_solution_strategy = getattr(
+            routing_enums_pb2.FirstSolutionStrategy, configuration['first_solution_strategy']
+        )
+
+        if configuration['metaheuristic'] == 'GUIDED_LOCAL_SEARCH':
+            search_parameters.guided_local_search_lambda_coefficient = \
+                configuration['guided_local_search_lambda_coefficient']
+
+        if configuration['randomized']:
+            search_parameters.local_search_operators.use_path_lns = optional_boolean_pb2.BOOL_TRUE
+
+        return search_parameters
@@ -0,0 +1,55 @@
+from multiprocessing.shared_memory import SharedMemory
+
+from numpy import dtype as array_dtype, ndarray
+
+from com.utils.distanceMatrix import DistanceMatrix, SymmetricDistanceMatrix
+
+
+class SharedDistanceMatrix:
+    """
+    Distance matrix published on a shared memory block, so worker processes read the parent's
+    values without parsing the instance again or receiving a pickled copy of it.
+
+    Only the name, shape and dtype of the block travel to the workers. attach() rebuilds the
+    same DistanceMatrix or SymmetricDistanceMatrix over the shared buffer, and since the dtype
+    already matches, neither class copies it. The parent owns the block and must release() it
+    once every worker is done. Workers are meant to be spawned by the parent, so they share its
+    resource tracker and never unlink the block on their own.
+    """
+    name: str = None
+    shape: tuple = None
+    dtype: str = None
+    size: int = None
+    symmetric: bool = None
+    __shared_memory = None
+
+    def __init__(self, distance_matrix):
+        values = distance_matrix.values
+
+        self.shape = values.shape
+        self.dtype = values.dtype.str
+        self.symmetric = isinstance(distance_matrix, SymmetricDistanceMatrix)
+        self.size = len(distance_matrix)
+        self.__shared_memory = SharedMemory(create=True, size=max(values.nbytes, 1))
+        self.name = self.__shared_memory.name
+
+        shared_values = ndarray(self.shape, dtype=values.dtype, buffer=self.__shared_memory.buf)
+        shared_values[...] = values
+
+    def attach(self):
+        self.__shared_memory = SharedMemory(name=self.name)
+        values = ndarray(self.shape, dtype=array_dtype(self.dtype), buffer=self.__shared_memory.buf)
+
+        if self.symmetric:
+            return SymmetricDistanceMatrix(values=values, size=self.size, dtype=values.dtype)
+
+        return DistanceMatrix(values=values, dtype=values.dtype)
+
+    def release(self):
+        self.__shared_memory.close()
+        self.__shared_memory.unlink()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_SharedDistanceMatrix__shared_memory', None)
+        return state
@@ -0,0 +1,196 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from json import dumps
+from multiprocessing import get_context
+from os import getcwd, makedirs
+from os.path import dirname, exists
+from platform import python_version
+from sys import argv, platform
+
+from ortools import __version__ as ortools_version
+from pytz import timezone
+
+from com.utils.orToolsTSPSolver import OrToolsTSPSolver
+from com.utils.orToolsVRPSolver import OrToolsVRPSolver
+from com.utils.routeLoader import RouteLoader
+
+try:
+    from resource import getrusage, RUSAGE_SELF
+except ImportError:
+    getrusage = None
+
+STRATEGIES = ['GLOBAL_CHEAPEST_ARC', 'PATH_CHEAPEST_ARC', 'GUIDED_LOCAL_SEARCH']
+
+# the bundled instances, with the parameters of their own scripts
+INSTANCES = [
+    {
+        'solver': OrToolsTSPSolver,
+        'parameters': {
+            'problem_name': 'a280', 'matrix_rows_size': 280, 'matrix_columns_size': 280,
+            'matrix_type': 'TSPLIB', 'coordinates_type': 'int', 'calc_dist_type': 'EUCLIDEAN'
+        }
+    },
+    {
+        'solver': OrToolsTSPSolver,
+        'parameters': {
+            'problem_name': 'pr2392', 'matrix_rows_size': 2392, 'matrix_columns_size': 2392,
+            'matrix_type': 'TSPLIB', 'coordinates_type': 'scientific_notation', 'calc_dist_type': 'EUCLIDEAN'
+        }
+    },
+    *[
+        {
+            'solver': OrToolsTSPSolver,
+            'parameters': {
+                'problem_name': f'{matrix_type}_{size}', 'matrix_rows_size': size + 1, 'matrix_columns_size': size + 1,
+                'matrix_type': matrix_type, 'coordinates_type': 'int', 'calc_dist_type': None
+            }
+        }
+        for matrix_type in ['rio_claro', 'real_world'] for size in [20, 200, 2000]
+    ],
+    *[
+        {
+            'solver': OrToolsVRPSolver,
+            'parameters': {
+                'problem_name': f'rio_claro_{size}', 'matrix_rows_size': size + 1, 'matrix_columns_size': size + 1,
+                'matrix_type': 'rio_claro', 'coordinates_type': 'int', 'calc_dist_type': None,
+                'dimension_name': 'Hours', 'num_vehicles': num_vehicles, 'upper_limit_coefficient': upper_limit_coefficient
+            }
+        }
+        for size, num_vehicles, upper_limit_coefficient in [(20, 3, 0.75), (200, 8, 0.5), (2000, 20, 0.5)]
+    ]
+]
+
+
+def peak_rss_megabytes():
+    if getrusage is not None:
+        # ru_maxrss is given in bytes on macOS and in kilobytes everywhere else
+        return getrusage(RUSAGE_SELF).ru_maxrss / (1000000 if platform == 'darwin' else 1000)
+
+    if platform == 'win32':
+        from ctypes import byref, c_size_t, c_ulong, c_void_p, sizeof, Structure, windll
+
+        class ProcessMemoryCounters(Structure):
+            _fields_ = [
+                ('cb', c_ulong), ('PageFaultCount', c_ulong),
+                ('PeakWorkingSetSize', c_size_t), ('WorkingSetSize', c_size_t),
+                ('QuotaPeakPagedPoolUsage', c_size_t), ('QuotaPagedPoolUsage', c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', c_size_t), ('QuotaNonPagedPoolUsage', c_size_t),
+                ('PagefileUsage', c_size_t), ('PeakPagefileUsage', c_size_t)
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = sizeof(counters)
+        windll.kernel32.GetCurrentProcess.restype = c_void_p
+        windll.psapi.GetProcessMemoryInfo(c_void_p(windll.kernel32.GetCurrentProcess()), byref(counters), counters.cb)
+
+        return counters.PeakWorkingSetSize / 1000000
+
+    return None
+
+
+def instance_file_path(parameters):
+    return r"{}\{}\files\{}\{}.txt".format(
+        dirname(getcwd()),
+        parameters['matrix_type'].casefold(),
+        parameters['problem_name'],
+        parameters['problem_name']
+    )
+
+
+def optimum_tour_file_path(parameters):
+    return r"{}\{}\files\{}\TSP_{}_opt_tour.txt".format(
+        dirname(getcwd()),
+        parameters['matrix_type'].casefold(),
+        parameters['problem_name'],
+        parameters['problem_name']
+    )
+
+
+def run_case(instance, strategy, time_limit_seconds):
+    solver = instance['solver'](
+        **instance['parameters'],
+        strategies=[strategy],
+        time_limit_on_seconds_to_metaheuristics=time_limit_seconds,
+        log_search_on_terminal=False
+    )
+    solver.execute_strategies()
+    result = solver.results[strategy]
+
+    record = {
+        'instance': instance['parameters']['problem_name'],
+        'solver': instance['solver'].__name__,
+        'strategy': strategy,
+        'time_limit_seconds': time_limit_seconds if strategy == 'GUIDED_LOCAL_SEARCH' else None,
+        'nodes': instance['parameters']['matrix_rows_size'],
+        'parse_seconds': solver.instance_load_seconds,
+        'loaded_from_cache': solver.instance_loaded_from_cache,
+        'model_build_seconds': result['model_build_seconds'],
+        'solve_seconds': result['solve_seconds'],
+        'objective': result['objective'],
+        'distance': solver.routes_distance(routes=result['routes']) if result['routes'] is not None else None,
+        'optimum_distance': None,
+        'gap_percent': None,
+        'phase_seconds': {path: phase['seconds'] for path, phase in solver.phase_profiler.phases.items()}
+    }
+
+    # the optimum tour files hold a single tour, so the gap is only meaningful for the TSP
+    if isinstance(solver, OrToolsTSPSolver) and exists(optimum_tour_file_path(instance['parameters'])):
+        record['optimum_distance'] = solver.routes_distance(
+            routes=RouteLoader.load(file_path=optimum_tour_file_path(instance['parameters']))
+        )
+
+        if record['distance'] is not None:
+            record['gap_percent'] = 100 * (record['distance'] - record['optimum_distance']) / record['optimum_distance']
+
+    # measured last, so it covers parsing, model building and solving
+    record['peak_rss_megabytes'] = peak_rss_megabytes()
+
+    return record
+
+
+def run_benchmark(instances, strategies, time_limit_seconds, results_file_path):
+    with open(file=results_file_path, mode='a', buffering=1) as results_file:
+        for instance in instances:
+            if not exists(instance_file_path(instance['parameters'])):
+                print(f"Skipping {instance['parameters']['problem_name']}, {instance_file_path(instance['parameters'])} not found")
+                continue
+
+            for strategy in strategies:
+                print(f"Benchmarking {instance['solver'].__name__} on {instance['parameters']['problem_name']} with {strategy}")
+
+                # a fresh process per case, so the peak RSS is the one of that case alone
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                    try:
+                        record = executor.submit(run_case, instance, strategy, time_limit_seconds).result()
+                    except Exception as e:
+                        record = {
+                            'instance': instance['parameters']['problem_name'],
+                            'solver': instance['solver'].__name__,
+                            'strategy': strategy,
+                            'error': str(e)
+                        }
+
+                record = {
+                    **record,
+                    'ortools_version': ortools_version,
+                    'python_version': python_version(),
+                    'finished_at': datetime.now(timezone('America/Sao_Paulo')).isoformat()
+                }
+                results_file.write(dumps(record) + '\n')
+                print(f'    {record}')
+
+
+if __name__ == '__main__':
+    benchmark_time_limit_seconds = int(argv[1]) if len(argv) > 1 else 60
+    benchmark_directory = r"{}\benchmarks".format(dirname(getcwd()))
+    makedirs(benchmark_directory, exist_ok=True)
+
+    run_benchmark(
+        instances=INSTANCES,
+        strategies=STRATEGIES,
+        time_limit_seconds=benchmark_time_limit_seconds,
+        results_file_path=r"{}\benchmark_{}.jsonl".format(
+            benchmark_directory,
+            str(datetime.now(timezone('America/Sao_Paulo'))).replace(" ", "_").replace(".", "_").replace(":", "_")
+        )
+    )
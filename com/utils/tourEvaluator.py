@@ -0,0 +1,85 @@
+from numpy import arange, asarray, bincount, concatenate, cumsum, flatnonzero, int64
+
+from com.utils.routeLoader import RouteLoader
+
+
+class TourEvaluator:
+    """
+    Scores tours and routes against a distance matrix with vectorized gathers.
+
+    The arcs of every route of every solution are gathered from the matrix in one call and
+    summed per route from a cumulative sum, so scoring thousands of candidate solutions costs
+    one gather instead of a Python loop per arc. Besides the distances, an evaluation tells
+    whether the solution is a valid one: every route closed at the depot, every other node
+    visited exactly once, and no route longer than max_route_distance when there is one.
+    """
+    distance_matrix = None
+    max_route_distance: int = None
+    depot: int = None
+
+    def __init__(self, distance_matrix, max_route_distance=None, depot=0):
+        self.distance_matrix = distance_matrix
+        self.max_route_distance = max_route_distance
+        self.depot = depot
+
+    @staticmethod
+    def load(file_path):
+        return [asarray(route, dtype=int64) for route in RouteLoader.load(file_path=file_path)]
+
+    def route_distances(self, routes):
+        routes = [asarray(route, dtype=int64) for route in routes]
+
+        if not routes:
+            return asarray([], dtype=int64)
+
+        arcs = asarray([max(len(route) - 1, 0) for route in routes], dtype=int64)
+        arc_costs = self.distance_matrix.gather(
+            concatenate([route[:-1] for route in routes]),
+            concatenate([route[1:] for route in routes])
+        )
+        cumulative_costs = concatenate([[0], cumsum(arc_costs, dtype=int64)])
+        ends = cumsum(arcs)
+
+        return cumulative_costs[ends] - cumulative_costs[ends - arcs]
+
+    def evaluate(self, routes):
+        return self.evaluate_many(route_sets=[routes])[0]
+
+    def evaluate_many(self, route_sets):
+        route_sets = [[asarray(route, dtype=int64) for route in routes] for routes in route_sets]
+        route_distances = self.route_distances(routes=[route for routes in route_sets for route in routes])
+        evaluations = []
+        start = 0
+
+        for routes in route_sets:
+            evaluations.append(self.__evaluation(
+                routes=routes,
+                route_distances=route_distances[start:start + len(routes)]
+            ))
+            start += len(routes)
+
+        return evaluations
+
+    def __evaluation(self, routes, route_distances):
+        size = len(self.distance_matrix)
+        visits = bincount(
+            concatenate([route[1:-1] for route in routes] + [asarray([], dtype=int64)]),
+            minlength=size
+        )[:size]
+        customers = arange(size) != self.depot
+
+        evaluation = {
+            'total_distance': int(route_distances.sum()),
+            'route_distances': route_distances.tolist(),
+            'max_route_distance': int(route_distances.max()) if len(route_distances) else 0,
+            'closed': all(len(route) >= 2 and route[0] == route[-1] == self.depot for route in routes),
+            'missing_nodes': flatnonzero(customers & (visits == 0)).tolist(),
+            'repeated_nodes': flatnonzero(customers & (visits > 1)).tolist(),
+            'over_limit_routes': flatnonzero(route_distances > self.max_route_distance).tolist()
+            if self.max_route_distance is not None else []
+        }
+        evaluation['feasible'] = evaluation['closed'] and not (
+            evaluation['missing_nodes'] or evaluation['repeated_nodes'] or evaluation['over_limit_routes']
+        )
+
+        return evaluation
@@ -0,0 +1,235 @@
+from collections import deque
+from time import perf_counter
+
+from numpy import asarray, int32
+
+from com.utils.distanceMatrix import DistanceMatrix, SymmetricDistanceMatrix
+from com.utils.distanceOracle import LazyDistanceOracle
+
+
+class TourPolisher:
+    """
+    2-opt and Or-opt local search run on the routes a solver returns.
+
+    Each route is polished on its own, as a cycle through the depot held in a plain array with
+    the position of every node, so a 2-opt move reverses the shorter side of the cycle in place.
+    Moves are only looked for around the k nearest neighbors of a node, and nodes whose
+    surroundings did not change since their last unsuccessful scan are skipped (don't-look bits),
+    so polishing a 2000 nodes tour takes a fraction of a second. Routes only get shorter, so a
+    maximum route distance the solver respected is still respected. 2-opt reverses a path, which
+    changes its length on asymmetric matrices, so there only Or-opt moves are tried.
+    """
+    SEGMENT_LENGTHS = [1, 2, 3]
+
+    distance_matrix = None
+    neighbors: list = None
+    symmetric: bool = None
+    two_opt_moves: int = None
+    or_opt_moves: int = None
+    __distance = None
+
+    def __init__(self, distance_matrix, neighbors, symmetric=None):
+        self.distance_matrix = distance_matrix
+        self.neighbors = neighbors.tolist() if hasattr(neighbors, 'tolist') else neighbors
+        self.symmetric = symmetric if symmetric is not None else self.is_symmetric(distance_matrix)
+        self.__distance = distance_matrix.distance
+
+    @staticmethod
+    def is_symmetric(distance_matrix):
+        # packed and lazily computed matrices only exist for symmetric distances
+        if isinstance(distance_matrix, (SymmetricDistanceMatrix, LazyDistanceOracle)):
+            return True
+
+        if isinstance(distance_matrix, DistanceMatrix):
+            return DistanceMatrix.is_symmetric(distance_matrix.values)
+
+        return DistanceMatrix.is_symmetric(asarray(distance_matrix))
+
+    def polish(self, routes):
+        start_time = perf_counter()
+        self.two_opt_moves = 0
+        self.or_opt_moves = 0
+        position = [-1] * len(self.distance_matrix)
+        polished_routes = []
+
+        for route in routes:
+            route = [int(node) for node in route]
+
+            if len(route) < 5:
+                # with less than three customers no move changes the cycle
+                polished_routes.append(asarray(route, dtype=int32))
+                continue
+
+            tour = route[:-1]
+            self.__polish_cycle(tour=tour, position=position)
+
+            depot_position = position[route[0]]
+            tour = tour[depot_position:] + tour[:depot_position]
+
+            for node in tour:
+                position[node] = -1
+
+            polished_routes.append(asarray(tour + [route[0]], dtype=int32))
+
+        return polished_routes, perf_counter() - start_time
+
+    def __polish_cycle(self, tour, position):
+        for index, node in enumerate(tour):
+            position[node] = index
+
+        active = deque(tour)
+        queued = set(tour)
+
+        while active:
+            node = active.popleft()
+            queued.discard(node)
+            touched_nodes = None
+
+            if self.symmetric:
+                touched_nodes = self.__two_opt(tour=tour, position=position, node=node)
+
+            if touched_nodes is None:
+                touched_nodes = self.__or_opt(tour=tour, position=position, node=node)
+
+            if touched_nodes is None:
+                continue
+
+            for touched_node in touched_nodes:
+                if touched_node not in queued:
+                    active.append(touched_node)
+                    queued.add(touched_node)
+
+    def __two_opt(self, tour, position, node):
+        distance = self.__distance
+        size = len(tour)
+        node_position = position[node]
+
+        for direction in [1, -1]:
+            # forward removes (node, next) and (candidate, candidate next), backward the previous ones
+            next_node = tour[(node_position + direction) % size]
+            current_distance = distance(node, next_node) if direction == 1 else distance(next_node, node)
+
+            for candidate in self.neighbors[node]:
+                candidate_position = position[candidate]
+
+                if candidate_position == -1:
+                    continue
+
+                added_distance = distance(node, candidate)
+
+                if added_distance >= current_distance:
+                    break
+
+                candidate_next = tour[(candidate_position + direction) % size]
+
+                if candidate_next == node or candidate == next_node:
+                    continue
+
+                delta = added_distance + distance(next_node, candidate_next) - current_distance \
+                    - distance(candidate, candidate_next)
+
+                if delta < 0:
+                    if direction == 1:
+                        self.__reverse(tour, position, position[next_node], candidate_position)
+                    else:
+                        self.__reverse(tour, position, candidate_position, position[next_node])
+
+                    self.two_opt_moves += 1
+                    return [node, next_node, candidate, candidate_next]
+
+        return None
+
+    def __or_opt(self, tour, position, node):
+        distance = self.__distance
+        size = len(tour)
+        first_position = position[node]
+
+        for segment_length in self.SEGMENT_LENGTHS:
+            if segment_length > size - 3:
+                break
+
+            segment = [tour[(first_position + offset) % size] for offset in range(segment_length)]
+            first, last = segment[0], segment[-1]
+            previous_node = tour[(first_position - 1) % size]
+            next_node = tour[(first_position + segment_length) % size]
+            removal_gain = distance(previous_node, first) + distance(last, next_node) \
+                - distance(previous_node, next_node)
+            segment_distance = sum(distance(a, b) for a, b in zip(segment, segment[1:]))
+            reversed_segment_distance = sum(distance(b, a) for a, b in zip(segment, segment[1:])) \
+                if not self.symmetric else segment_distance
+
+            if removal_gain <= 0:
+                continue
+
+            for end, end_is_first in [(first, True), (last, False)]:
+                for candidate in self.neighbors[end]:
+                    candidate_position = position[candidate]
+
+                    if candidate_position == -1 or candidate in segment:
+                        continue
+
+                    if distance(candidate, end) >= removal_gain and distance(end, candidate) >= removal_gain:
+                        break
+
+                    candidate_next = tour[(candidate_position + 1) % size]
+                    candidate_previous = tour[(candidate_position - 1) % size]
+
+                    # the segment goes between candidate and one of its tour neighbors, touching it with end
+                    for before, after in [(candidate, candidate_next), (candidate_previous, candidate)]:
+                        if before in segment or after in segment:
+                            continue
+
+                        reverse = (before == candidate) != end_is_first
+                        head, tail = (last, first) if reverse else (first, last)
+                        delta = distance(before, head) + distance(tail, after) - distance(before, after) \
+                            + (reversed_segment_distance if reverse else segment_distance) \
+                            - segment_distance - removal_gain
+
+                        if delta < 0:
+                            self.__move_segment(tour, position, segment, before, reverse)
+                            self.or_opt_moves += 1
+                            return [previous_node, next_node, before, after, first, last]
+
+        return None
+
+    @staticmethod
+    def __reverse(tour, position, first_position, last_position):
+        size = len(tour)
+        length = (last_position - first_position) % size + 1
+
+        if 2 * length > size:
+            # on a symmetric cycle reversing the complement gives the same tour, walked the other way
+            first_position, last_position = (last_position + 1) % size, (first_position - 1) % size
+            length = size - length
+
+        for _ in range(length // 2):
+            tour[first_position], tour[last_position] = tour[last_position], tour[first_position]
+            position[tour[first_position]] = first_position
+            position[tour[last_position]] = last_position
+            first_position = (first_position + 1) % size
+            last_position = (last_position - 1) % size
+
+    @staticmethod
+    def __move_segment(tour, position, segment, before, reverse):
+        size = len(tour)
+        segment_length = len(segment)
+        first_position = position[segment[0]]
+        before_position = position[before]
+        inserted = segment[::-1] if reverse else segment
+        forward_shift = (before_position - first_position) % size - segment_length + 1
+        backward_shift = (first_position - before_position) % size - 1
+
+        if forward_shift <= backward_shift:
+            # the nodes after the segment up to before move back over it
+            nodes = [tour[(first_position + segment_length + offset) % size] for offset in range(forward_shift)]
+            nodes += inserted
+            start_position = first_position
+        else:
+            # the nodes after before up to the segment move forward over it
+            nodes = inserted + [tour[(before_position + 1 + offset) % size] for offset in range(backward_shift)]
+            start_position = (before_position + 1) % size
+
+        for offset, moved_node in enumerate(nodes):
+            moved_position = (start_position + offset) % size
+            tour[moved_position] = moved_node
+            position[moved_node] = moved_position
@@ -0,0 +1,136 @@
+from logging import getLogger
+
+from numpy import arange, asarray, full, int64
+
+from com.utils.distanceOracle import LazyDistanceOracle
+
+
+class TransitEvaluator:
+    """
+    Registers the distance matrix as the transit evaluator of a routing model.
+
+    - callback: the original Python callback, translating both indices through the manager on
+      every arc evaluated by the search.
+    - flat_index: Python callback over an index to node list precomputed once, with no manager
+      calls or dict lookups per arc.
+    - native_matrix: the whole matrix handed to the routing engine with RegisterTransitMatrix,
+      so arcs are evaluated in C++ without calling back into Python at all. The engine takes the
+      matrix as a list of lists of Python ints, built one row at a time but held whole while it
+      is registered, which costs as much as the list of lists the compact matrices replaced.
+      OR-tools releases without RegisterTransitMatrix, such as 9.0, fall back to flat_index.
+
+    When candidate nodes are given, the arc cost evaluator charges a penalty on every arc that
+    is not a candidate one, while the transit, used by dimensions, keeps the plain distances.
+    """
+    EVALUATORS = ['callback', 'flat_index', 'native_matrix']
+
+    evaluator: str = None
+    manager = None
+    distance_matrix = None
+    index_to_node: list = None
+    transit_callback = None
+    candidate_nodes: list = None
+    non_candidate_penalty: int = None
+    free_nodes: list = None
+    arc_cost_callback = None
+
+    def __init__(self, manager, distance_matrix, evaluator='callback'):
+        if evaluator not in self.EVALUATORS:
+            raise ValueError(f'Unknown transit evaluator {evaluator}, expected one of {self.EVALUATORS}')
+
+        if evaluator == 'native_matrix' and isinstance(distance_matrix, LazyDistanceOracle):
+            raise ValueError('The native_matrix transit evaluator needs a stored distance matrix, not a lazy one')
+
+        self.evaluator = evaluator
+        self.manager = manager
+        self.distance_matrix = distance_matrix
+        self.index_to_node = [manager.IndexToNode(index) for index in range(manager.GetNumberOfIndices())]
+        self.transit_callback = self.__make_transit_callback()
+
+    def __make_transit_callback(self):
+        if self.evaluator == 'flat_index':
+            index_to_node = self.index_to_node
+            distance = self.distance_matrix.distance
+
+            def flat_index_callback(from_index, to_index):
+                return distance(index_to_node[from_index], index_to_node[to_index])
+
+            return flat_index_callback
+
+        return self.distance_callback
+
+    def distance_callback(self, from_index, to_index):
+        from_node = self.manager.IndexToNode(from_index)
+        to_node = self.manager.IndexToNode(to_index)
+        return self.distance_matrix.distance(from_node, to_node)
+
+    def register(self, routing):
+        if self.evaluator == 'native_matrix' and not hasattr(routing, 'RegisterTransitMatrix'):
+            getLogger().info('RegisterTransitMatrix is not available on this OR-tools release, '
+                             'the flat_index transit evaluator is used instead of native_matrix')
+            self.evaluator = 'flat_index'
+            self.transit_callback = self.__make_transit_callback()
+
+        if self.evaluator == 'native_matrix':
+            return routing.RegisterTransitMatrix(
+                [asarray(self.distance_matrix[node], dtype=int64).tolist() for node in range(len(self.distance_matrix))]
+            )
+
+        return routing.RegisterTransitCallback(self.transit_callback)
+
+    @staticmethod
+    def default_non_candidate_penalty(distance_matrix, depot):
+        # by the triangle inequality through the depot, no arc (i, j) is longer than
+        # d(i, depot) + d(depot, j), so none is longer than the longest arcs into and out of the depot
+        size = len(distance_matrix)
+        depot_row = distance_matrix.gather(full(size, depot), arange(size))
+        depot_column = distance_matrix.gather(arange(size), full(size, depot))
+        return int(max(depot_row)) + int(max(depot_column))
+
+    def penalize_non_candidate_arcs(self, candidate_nodes, non_candidate_penalty, free_nodes):
+        self.candidate_nodes = candidate_nodes
+        self.non_candidate_penalty = non_candidate_penalty
+        self.free_nodes = free_nodes
+        self.arc_cost_callback = self.__make_arc_cost_callback()
+
+    def __make_arc_cost_callback(self):
+        index_to_node = self.index_to_node
+        distance = self.distance_matrix.distance
+        candidate_sets = [frozenset(candidates) for candidates in self.candidate_nodes]
+        free_nodes = frozenset(self.free_nodes)
+        non_candidate_penalty = self.non_candidate_penalty
+
+        def arc_cost_callback(from_index, to_index):
+            from_node = index_to_node[from_index]
+            to_node = index_to_node[to_index]
+
+            if to_node in candidate_sets[from_node] or from_node in free_nodes or to_node in free_nodes:
+                return distance(from_node, to_node)
+
+            return distance(from_node, to_node) + non_candidate_penalty
+
+        return arc_cost_callback
+
+    def register_arc_cost(self, routing, transit_callback_index):
+        if self.candidate_nodes is None:
+            return transit_callback_index
+
+        if self.evaluator != 'native_matrix':
+            return routing.RegisterTransitCallback(self.arc_cost_callback)
+
+        return routing.RegisterTransitMatrix(
+            [self.__penalized_row(node) for node in range(len(self.distance_matrix))]
+        )
+
+    def __penalized_row(self, node):
+        row = asarray(self.distance_matrix[node], dtype=int64)
+
+        if node in self.free_nodes:
+            return row.tolist()
+
+        # penalized everywhere but on the candidates, the free nodes and the node itself
+        penalized_row = row + self.non_candidate_penalty
+        kept_nodes = asarray(list(self.candidate_nodes[node]) + list(self.free_nodes) + [node], dtype=int64)
+        penalized_row[kept_nodes] = row[kept_nodes]
+
+        return penalized_row.tolist()
@@ -0,0 +1,87 @@
+from os import getcwd
+from os.path import dirname, exists
+from random import randrange
+from time import perf_counter
+
+from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+
+from com.utils.matrix import Matrix
+from com.utils.transitEvaluator import TransitEvaluator
+
+
+def callback_evaluations_per_second(transit_evaluator, number_of_indices, evaluations=1000000):
+    pairs = [(randrange(number_of_indices), randrange(number_of_indices)) for _ in range(evaluations)]
+    transit_callback = transit_evaluator.transit_callback
+
+    start_time = perf_counter()
+    for from_index, to_index in pairs:
+        transit_callback(from_index, to_index)
+
+    return evaluations / (perf_counter() - start_time)
+
+
+def solve_with_evaluator(manager, distance_matrix, evaluator):
+    start_time = perf_counter()
+
+    routing = pywrapcp.RoutingModel(manager)
+    transit_evaluator = TransitEvaluator(manager=manager, distance_matrix=distance_matrix, evaluator=evaluator)
+    transit_callback_index = transit_evaluator.register(routing)
+    routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
+    build_seconds = perf_counter() - start_time
+
+    search_parameters = pywrapcp.DefaultRoutingSearchParameters()
+    search_parameters.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+
+    start_time = perf_counter()
+    solution = routing.SolveWithParameters(search_parameters)
+
+    return build_seconds, perf_counter() - start_time, solution.ObjectiveValue() if solution else None
+
+
+if __name__ == '__main__':
+    matrix_type = 'rio_claro'
+    problem_name = 'rio_claro_2000'
+    size = 2001
+
+    local_file_path = r"{}\{}\files\{}\{}.txt".format(
+        dirname(getcwd()),
+        matrix_type,
+        problem_name,
+        problem_name
+    )
+
+    if not exists(local_file_path):
+        raise FileNotFoundError(f'File {local_file_path} not found')
+
+    matrix = Matrix(
+        rows_size=size,
+        columns_size=size,
+        matrix_type=matrix_type,
+        coordinates_type='int',
+        calc_dist_type=None
+    )
+    matrix.build_matrix(file_path=local_file_path, use_cache=True)
+
+    routing_index_manager = pywrapcp.RoutingIndexManager(size, 1, 0)
+
+    print(f'{problem_name} ({size} nodes, {type(matrix.matrix).__name__})')
+
+    for evaluator_name in ['callback', 'flat_index']:
+        evaluations_per_second = callback_evaluations_per_second(
+            transit_evaluator=TransitEvaluator(
+                manager=routing_index_manager,
+                distance_matrix=matrix.matrix,
+                evaluator=evaluator_name
+            ),
+            number_of_indices=routing_index_manager.GetNumberOfIndices()
+        )
+        print(f'    {evaluator_name:14} callback: {evaluations_per_second:12.0f} evaluations/s')
+
+    for evaluator_name in TransitEvaluator.EVALUATORS:
+        model_seconds, solve_seconds, objective = solve_with_evaluator(
+            manager=routing_index_manager,
+            distance_matrix=matrix.matrix,
+            evaluator=evaluator_name
+        )
+        print(f'    {evaluator_name:14} PATH_CHEAPEST_ARC: model {model_seconds:8.3f} s, '
+              f'solve {solve_seconds:8.3f} s, objective {objective}')